@@ -16,6 +16,7 @@
 
 """DDNS Manager: Initializes notifiers and updaters and manages the addrfile"""
 
+import functools
 import importlib
 import logging
 import os.path
@@ -23,9 +24,9 @@ import sys
 from typing import Optional, Any, Union, Dict, Tuple, cast
 
 if sys.version_info < (3, 10):
-    from importlib_metadata import entry_points
+    from importlib_metadata import entry_points, EntryPoints
 else:
-    from importlib.metadata import entry_points
+    from importlib.metadata import entry_points, EntryPoints
 
 from . import Addrfile
 from . import configuration
@@ -220,6 +221,19 @@ def validate_updater_type(module: Optional[str], type_: str) -> bool:
     )
 
 
+# The cache lasts for the life of the process: plugins installed after the
+# first lookup in a group are never seen.
+@functools.lru_cache(maxsize=None)
+def _entry_points(group: str) -> EntryPoints:
+    """Discover the entry points in the given group. Discovery scans every
+    installed distribution, so it is only done once per group.
+
+    :param group: The entry point group, e.g. ``"ruddr.notifier"``
+    :returns: The entry points in that group, indexable by name
+    """
+    return entry_points(group=group)
+
+
 def _validate_updater_or_notifier_type(
     which: str,
     existing: Dict[Union[str, Tuple[str, str]], Any],
@@ -243,7 +257,7 @@ def _validate_updater_or_notifier_type(
         if type_ in existing:
             return True
         # Check if a ruddr entry point with this name exists
-        discovered = entry_points(group=f"ruddr.{which}")
+        discovered = _entry_points(f"ruddr.{which}")
         try:
             entry_point = discovered[type_]
         except KeyError:
@@ -255,11 +269,14 @@ def _validate_updater_or_notifier_type(
     if (module, type_) in existing:
         return True
 
-    # Check if it's importable
-    try:
-        imported_module = importlib.import_module(module)
-    except ImportError:
-        return False
+    # Check if it's importable. Modules that are already imported come
+    # straight from sys.modules, without going through the import machinery.
+    imported_module = sys.modules.get(module)
+    if imported_module is None:
+        try:
+            imported_module = importlib.import_module(module)
+        except ImportError:
+            return False
     try:
         imported_class = getattr(imported_module, type_)
     except AttributeError:
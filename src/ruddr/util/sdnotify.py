@@ -87,9 +87,7 @@ def _args_to_bytes(**kwargs):
     """
     msg = bytearray()
     for arg, val in kwargs.items():
-        arg_bytes = arg.encode('utf-8')
-        val_bytes = str(val).encode('utf-8')
-        msg += arg_bytes + b'=' + val_bytes + b'\n'
+        msg += f'{arg}={val}\n'.encode('utf-8')
     return bytes(msg)
 
 
@@ -14,14 +14,18 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import itertools
 import threading
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 import pytest
 
 import doubles
 import ruddr.addrfile
 
+#: Called by a :class:`VirtualTimer` when it completes or is canceled
+TimerCallback = Callable[['VirtualTimer'], None]
+
 
 class VirtualTimer:
     """Drop-in for :class:`threading.Timer` that uses a virtual clock
@@ -30,7 +34,8 @@ class VirtualTimer:
     :meth:`start` or :meth:`advance` is called if the virtual time has
     exceeded the interval time."""
 
-    def __init__(self, interval, function, args=None, kwargs=None):
+    def __init__(self, interval, function, args=None, kwargs=None,
+                 on_complete: Optional[TimerCallback] = None):
         super().__init__()
         self._function = function
         self._args = args if args is not None else []
@@ -39,6 +44,7 @@ class VirtualTimer:
         self._lock = threading.Lock()
         self._complete = False
         self._elapsed = 0.0
+        self._on_complete = on_complete
 
         self._started = False
         self.daemon = False
@@ -47,7 +53,7 @@ class VirtualTimer:
         """Stop the timer if it hasn't finished yet."""
         with self._lock:
             self._elapsed = self._interval
-            self._complete = True
+            self._set_complete()
 
     def advance(self, seconds):
         """Advance the virtual clock"""
@@ -69,7 +75,14 @@ class VirtualTimer:
         if self._elapsed < self._interval:
             return
         self._function(*self._args, **self._kwargs)
+        self._set_complete()
+
+    def _set_complete(self):
+        if self._complete:
+            return
         self._complete = True
+        if self._on_complete is not None:
+            self._on_complete(self)
 
     def start(self):
         with self._lock:
@@ -85,22 +98,31 @@ def advance():
     class Advancer:
         def __init__(self):
             self.timers: List[VirtualTimer] = []
+            # Timers that have not completed yet. A dict rather than a set so
+            # iteration keeps creation order.
+            self._running: Dict[VirtualTimer, None] = {}
 
         def new_timer(self, *args, **kwargs):
             """Create a new virtual timer under the control of this Advancer"""
-            timer = VirtualTimer(*args, **kwargs)
+            timer = VirtualTimer(*args, **kwargs,
+                                 on_complete=self._timer_complete)
             self.timers.append(timer)
+            self._running[timer] = None
             return timer
 
+        def _timer_complete(self, timer: VirtualTimer):
+            """Callback for when a timer finishes or is cancelled"""
+            self._running.pop(timer, None)
+
         def by_minimum_or(self, seconds: float):
             """Advance virtual time just long enough for at least one timer
             to expire or by the given number of seconds, whichever is less, and
             return the number of seconds leftover"""
-            remaining_times = [seconds] + [t.remaining for t in self.timers
-                                           if t.remaining is not None]
-            to_advance = min(remaining_times)
-            # Make copy of self.timers so newly created timers aren't advanced
-            for timer in list(self.timers):
+            # Make copy of self._running so newly created timers aren't
+            # advanced (and so completed timers can be removed while looping)
+            running = list(self._running)
+            to_advance = min([seconds] + [t.remaining for t in running])
+            for timer in running:
                 timer.advance(to_advance)
             return seconds - to_advance
 
@@ -116,18 +138,17 @@ def advance():
 
         def until_done(self):
             """Advance virtual time until all timers have elapsed"""
-            while any(t.remaining is not None for t in self.timers):
+            while self._running:
                 self.by_minimum()
 
         def cancel_all(self):
             """Cancel all timers remaining"""
-            for timer in self.timers:
-                if timer.remaining is not None:
-                    timer.cancel()
+            for timer in list(self._running):
+                timer.cancel()
 
         def count_running(self):
             """Count the number of timers that have not completed"""
-            return sum(t.remaining is not None for t in self.timers)
+            return len(self._running)
 
     advancer = Advancer()
 
@@ -139,31 +160,38 @@ def advance():
     threading.Timer = orig_timer
 
 
-@pytest.fixture
+class NotifierFactory:
+    """Factory for fake :class:`~ruddr.Notifier` with unique names"""
+
+    def __init__(self):
+        self._count = itertools.count(1)
+
+    def __call__(self, **kwargs):
+        config = kwargs
+        return doubles.FakeNotifier(f'fake_notifier_{next(self._count)}',
+                                    config)
+
+
+class UpdaterFactory:
+    """Factory for mock :class:`~ruddr.Updater` with unique names"""
+
+    def __init__(self):
+        self._count = itertools.count(1)
+
+    def __call__(self, **kwargs):
+        return doubles.MockBaseUpdater(f'mock_updater_{next(self._count)}',
+                                       **kwargs)
+
+
+@pytest.fixture(scope='session')
 def notifier_factory():
     """Fixture creating a factory for fake :class:`~ruddr.Notifier`"""
-    class NotifierFactory:
-        def __init__(self):
-            self._count = 0
-
-        def __call__(self, **kwargs):
-            self._count += 1
-            config = kwargs
-            return doubles.FakeNotifier(f'fake_notifier_{self._count}', config)
     return NotifierFactory()
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def updater_factory():
     """Fixture creating a factory for mock :class:`~ruddr.Updater`"""
-    class UpdaterFactory:
-        def __init__(self):
-            self._count = 0
-
-        def __call__(self, **kwargs):
-            self._count += 1
-            return doubles.MockBaseUpdater(f'mock_updater_{self._count}',
-                                           **kwargs)
     return UpdaterFactory()
 
 
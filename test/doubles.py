@@ -17,45 +17,92 @@
 """Test doubles for use in test classes and fixtures"""
 import collections
 import errno
+import functools
 import ipaddress
-import itertools
-from typing import List, Tuple, Set, Optional, Dict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import ruddr
 import ruddr.util
 from ruddr import NotifierSetupError, Addrfile, PublishError
 
 
+#: Config values considered true by :func:`_as_bool`
+_TRUTHY = frozenset(('true', 'yes', 'on', '1'))
+
+
+def _as_bool(value: str) -> bool:
+    """Parse a boolean config value the same way Ruddr does"""
+    return value.lower() in _TRUTHY
+
+
+def is_error(result) -> bool:
+    """Check whether a mock result is an exception (instance or class)"""
+    return (isinstance(result, BaseException) or
+            (isinstance(result, type) and issubclass(result, BaseException)))
+
+
 def raise_or_return(result):
-    if isinstance(result, BaseException):
-        raise result
-    if isinstance(result, type) and issubclass(result, BaseException):
+    if is_error(result):
         raise result
     return result
 
 
+class ResultTable:
+    """Results for a mock method keyed by its arguments. Results that are
+    exceptions are split out up front, so looking up a result does not need
+    to check its type.
+
+    :param results: Dict of results. Exceptions (instances or classes) are
+                    raised when looked up and anything else is returned.
+    """
+
+    def __init__(self, results: dict):
+        self._raises = {}
+        self._returns = {}
+        for key, result in results.items():
+            if is_error(result):
+                self._raises[key] = result
+            else:
+                self._returns[key] = result
+
+    def __getitem__(self, key):
+        error = self._raises.get(key)
+        if error is not None:
+            raise error
+        return self._returns[key]
+
+
+def result_table(results: Optional[dict]) -> Optional[ResultTable]:
+    """Wrap a dict of mock results in a :class:`ResultTable`, passing through
+    ``None`` (meaning the method is not implemented)"""
+    if results is None:
+        return None
+    return ResultTable(results)
+
+
+def dispatch_result(table: Optional[ResultTable], key):
+    """Look up a mock method's result in a :class:`ResultTable` and return it
+    (or raise it, if it's an exception). Raise :exc:`NotImplementedError` if
+    there is no table."""
+    if table is None:
+        raise NotImplementedError
+    return table[key]
+
+
 class BrokenFile:
-    """File-like object that raises an exception when being read from"""
-    def __init__(self, write_broken=False):
-        self.write_broken = write_broken
+    """File-like object that raises an exception when being read from (or
+    written to, if ``write_broken`` is true). Constructing it gives either a
+    :class:`_ReadBrokenFile` or a :class:`_WriteBrokenFile`."""
 
-    def __iter__(self):
-        if self.write_broken:
-            return iter([])
-        else:
-            raise OSError(errno.ETIMEDOUT, "timeout")
+    write_broken = False
 
-    def read(self, *_):
-        if self.write_broken:
-            return ""
-        else:
-            raise OSError(errno.ETIMEDOUT, "timeout")
+    def __new__(cls, write_broken=False):
+        if cls is BrokenFile:
+            cls = _WriteBrokenFile if write_broken else _ReadBrokenFile
+        return super().__new__(cls)
 
-    def write(self, *_):
-        if self.write_broken:
-            raise OSError(errno.ETIMEDOUT, "timeout")
-        else:
-            return 0
+    def __init__(self, write_broken=False):
+        pass
 
     def __enter__(self):
         return self
@@ -64,6 +111,39 @@ class BrokenFile:
         pass
 
 
+class _ReadBrokenFile(BrokenFile):
+    """:class:`BrokenFile` that raises when read from"""
+
+    # Iterating succeeds, but fetching the first line fails, like a read
+    # error partway through a real file
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        raise OSError(errno.ETIMEDOUT, "timeout")
+
+    def read(self, *_):
+        raise OSError(errno.ETIMEDOUT, "timeout")
+
+    def write(self, *_):
+        return 0
+
+
+class _WriteBrokenFile(BrokenFile):
+    """:class:`BrokenFile` that raises when written to"""
+
+    write_broken = True
+
+    def __iter__(self):
+        return iter([])
+
+    def read(self, *_):
+        return ""
+
+    def write(self, *_):
+        raise OSError(errno.ETIMEDOUT, "timeout")
+
+
 class MockZoneSplitter(ruddr.util.ZoneSplitter):
     """A mock ZoneSplitter that tracks the domains that have been split"""
 
@@ -91,10 +171,12 @@ class FakeNotifier(ruddr.BaseNotifier):
         super().__init__(name, config)
         self.config = config
         # Config vars to test .ipv4_ready() and .ipv6_ready()
-        self._ipv4_ready = (config.get('ipv4_ready', 'true').lower() in
-                            ('true', 'yes', 'on', '1'))
-        self._ipv6_ready = (config.get('ipv6_ready', 'true').lower() in
-                            ('true', 'yes', 'on', '1'))
+        self._ipv4_ready = self._config_bool('ipv4_ready')
+        self._ipv6_ready = self._config_bool('ipv6_ready')
+
+    def _config_bool(self, key: str) -> bool:
+        """Read a boolean option from the config, defaulting to true"""
+        return _as_bool(self.config.get(key, 'true'))
 
     def ipv4_ready(self):
         return self._ipv4_ready
@@ -107,58 +189,74 @@ class MockNotifier(ruddr.Notifier):
     """A mock Notifier whose checks succeed and fail in a predetermined order
     and which tracks when calls were made"""
 
+    #: Tag byte recorded for each abstract method call
+    _SETUP = ord('s')
+    _TEARDOWN = ord('t')
+    _CHECK = ord('c')
+    _CALL_NAMES = {_SETUP: 'setup', _TEARDOWN: 'teardown', _CHECK: 'check'}
+
     def __init__(self, name, config, success_sequence=None,
                  setup_implemented=True, teardown_implemented=True,
                  check_implemented=True, setup_error=False):
         super().__init__(name, config)
 
-        #: The order of successes and fails for check_once
-        if success_sequence is None:
-            self.success_iter = itertools.repeat(True)
-        else:
-            self.success_iter = iter(success_sequence)
+        # Return whether the next check_once succeeds, following the given
+        # sequence (and succeeding once it runs out). None means always
+        # succeed.
+        self._next_success: Optional[Callable[[], bool]] = (
+            None if success_sequence is None
+            else functools.partial(next, iter(success_sequence), True)
+        )
 
         self.setup_implemented = setup_implemented
         self.teardown_implemented = teardown_implemented
         self.check_implemented = check_implemented
         self.setup_error = setup_error
 
-        #: The order the abstract methods were called
-        self.call_sequence = []
+        # The order the abstract methods were called, one tag byte per call
+        # (see _CALL_NAMES). Exposed as a list of names by call_sequence.
+        self._calls = bytearray()
 
         # Used only for test_manager.py
         self.stop_count = 0
 
+    @property
+    def call_sequence(self) -> List[str]:
+        """The order the abstract methods were called"""
+        return [self._CALL_NAMES[tag] for tag in self._calls]
+
     @property
     def setup_count(self):
-        return sum(call == 'setup' for call in self.call_sequence)
+        return self._calls.count(self._SETUP)
 
     @property
     def teardown_count(self):
-        return sum(call == 'teardown' for call in self.call_sequence)
+        return self._calls.count(self._TEARDOWN)
 
     @property
     def check_count(self):
-        return sum(call == 'check' for call in self.call_sequence)
+        return self._calls.count(self._CHECK)
 
     def setup(self):
-        self.call_sequence.append('setup')
+        self._calls.append(self._SETUP)
         if not self.setup_implemented:
             raise NotImplementedError
         if self.setup_error:
             raise NotifierSetupError
 
     def teardown(self):
-        self.call_sequence.append('teardown')
+        self._calls.append(self._TEARDOWN)
         if not self.teardown_implemented:
             raise NotImplementedError
 
     def check_once(self):
-        self.call_sequence.append('check')
+        self._calls.append(self._CHECK)
         if not self.check_implemented:
             raise NotImplementedError
-        success = next(self.success_iter)
-        if not success:
+        next_success = self._next_success
+        if next_success is None:
+            return
+        if not next_success():
             raise ruddr.NotifyError
 
     # test_manager needs to tell if stop was called even if start was not
@@ -178,14 +276,17 @@ class MockBaseUpdater(ruddr.BaseUpdater):
         super().__init__(name, addrfile)
         self.config = config
         self.published_addresses = []
+        # Bound once here since update_ipv4/6 may be called many times
+        self._publish = self.published_addresses.append
         self.initial_update_calls: List[Tuple[bool, bool]] = []
 
-        #: The order of successes and fails for retry_test. None means success,
-        #: an error means raise that error
-        if err_sequence is None:
-            self.err_iter = itertools.repeat(None)
-        else:
-            self.err_iter = iter(err_sequence)
+        # Return the next result for retry_test: None means success, an
+        # error means raise that error (and success once the sequence runs
+        # out). None if no sequence was given.
+        self._next_error: Optional[Callable[[], Any]] = (
+            None if err_sequence is None
+            else functools.partial(next, iter(err_sequence), None)
+        )
         #: The list of calls to retry_test
         self.retry_sequence = []
 
@@ -193,7 +294,10 @@ class MockBaseUpdater(ruddr.BaseUpdater):
     def retry_test(self, param: int):
         """A dummy function to test @Retry. Only used in test_baseupdater."""
         self.retry_sequence.append(param)
-        error = next(self.err_iter)
+        next_error = self._next_error
+        if next_error is None:
+            return
+        error = next_error()
         if error is not None:
             raise error
 
@@ -201,10 +305,10 @@ class MockBaseUpdater(ruddr.BaseUpdater):
         self.initial_update_calls.append((ipv4_attached, ipv6_attached))
 
     def update_ipv4(self, address):
-        self.published_addresses.append(address)
+        self._publish(address)
 
     def update_ipv6(self, network):
-        self.published_addresses.append(network)
+        self._publish(network)
 
 
 class MockUpdater(ruddr.Updater):
@@ -216,32 +320,43 @@ class MockUpdater(ruddr.Updater):
         super().__init__(name, addrfile)
         self.ipv4s_published: List[ipaddress.IPv4Address] = []
         self.ipv6s_published: List[ipaddress.IPv6Network] = []
-
-        if ipv4_errors is None:
-            self.ipv4_iter = itertools.repeat(None)
-        else:
-            self.ipv4_iter = iter(ipv4_errors)
-        if ipv6_errors is None:
-            self.ipv6_iter = itertools.repeat(None)
-        else:
-            self.ipv6_iter = iter(ipv6_errors)
+        # Bound once here since publish_ipv4/6 may be called many times
+        self._append_ipv4 = self.ipv4s_published.append
+        self._append_ipv6 = self.ipv6s_published.append
+
+        # Return the next error to raise, or None for success (also the case
+        # once the sequence runs out). None if no sequence was given.
+        self._next_ipv4_error: Optional[Callable[[], Any]] = (
+            None if ipv4_errors is None
+            else functools.partial(next, iter(ipv4_errors), None)
+        )
+        self._next_ipv6_error: Optional[Callable[[], Any]] = (
+            None if ipv6_errors is None
+            else functools.partial(next, iter(ipv6_errors), None)
+        )
 
         self.ipv4_implemented = ipv4_implemented
         self.ipv6_implemented = ipv6_implemented
 
     def publish_ipv4(self, address: ipaddress.IPv4Address):
-        self.ipv4s_published.append(address)
+        self._append_ipv4(address)
         if not self.ipv4_implemented:
             raise NotImplementedError
-        error = next(self.ipv4_iter)
+        next_error = self._next_ipv4_error
+        if next_error is None:
+            return
+        error = next_error()
         if error is not None:
             raise error
 
     def publish_ipv6(self, network: ipaddress.IPv6Network):
-        self.ipv6s_published.append(network)
+        self._append_ipv6(network)
         if not self.ipv6_implemented:
             raise NotImplementedError
-        error = next(self.ipv6_iter)
+        next_error = self._next_ipv6_error
+        if next_error is None:
+            return
+        error = next_error()
         if error is not None:
             raise error
 
@@ -292,6 +407,13 @@ class MockOneWayUpdater(ruddr.OneWayUpdater):
             raise PublishError
 
 
+def _recorded_calls(method: str) -> property:
+    """Create a read-only property listing the recorded calls to the given
+    method (see ``MockTwoWayZoneUpdater._record``)"""
+    return property(lambda self: self._calls.setdefault(method, []),
+                    doc=f"List of calls to :meth:`{method}`")
+
+
 class MockTwoWayZoneUpdater(ruddr.TwoWayZoneUpdater):
     """Mock TwoWayZoneUpdater that tracks calls to its abstract methods"""
 
@@ -308,24 +430,36 @@ class MockTwoWayZoneUpdater(ruddr.TwoWayZoneUpdater):
         super().__init__(name, addrfile, datadir)
 
         self.get_zones_result = get_zones_result
-        self.fetch_zone_ipv4s_result = fetch_zone_ipv4s_result
-        self.fetch_zone_ipv6s_result = fetch_zone_ipv6s_result
-        self.fetch_subdomain_ipv4s_result = fetch_subdomain_ipv4s_result
-        self.fetch_subdomain_ipv6s_result = fetch_subdomain_ipv6s_result
-        self.put_zone_ipv4s_result = put_zone_ipv4s_result
-        self.put_zone_ipv6s_result = put_zone_ipv6s_result
-        self.put_subdomain_ipv4_result = put_subdomain_ipv4_result
-        self.put_subdomain_ipv6s_result = put_subdomain_ipv6s_result
+        self.fetch_zone_ipv4s_result = result_table(fetch_zone_ipv4s_result)
+        self.fetch_zone_ipv6s_result = result_table(fetch_zone_ipv6s_result)
+        self.fetch_subdomain_ipv4s_result = result_table(
+            fetch_subdomain_ipv4s_result)
+        self.fetch_subdomain_ipv6s_result = result_table(
+            fetch_subdomain_ipv6s_result)
+        self.put_zone_ipv4s_result = result_table(put_zone_ipv4s_result)
+        self.put_zone_ipv6s_result = result_table(put_zone_ipv6s_result)
+        self.put_subdomain_ipv4_result = result_table(
+            put_subdomain_ipv4_result)
+        self.put_subdomain_ipv6s_result = result_table(
+            put_subdomain_ipv6s_result)
 
         self.get_zones_call_count = 0
-        self.fetch_zone_ipv4s_calls = []
-        self.fetch_zone_ipv6s_calls = []
-        self.fetch_subdomain_ipv4s_calls = []
-        self.fetch_subdomain_ipv6s_calls = []
-        self.put_zone_ipv4s_calls = []
-        self.put_zone_ipv6s_calls = []
-        self.put_subdomain_ipv4_calls = []
-        self.put_subdomain_ipv6s_calls = []
+        # Calls to each method, keyed by method name. Lists are only created
+        # once a method is called or its *_calls attribute is read.
+        self._calls: Dict[str, list] = {}
+
+    fetch_zone_ipv4s_calls = _recorded_calls('fetch_zone_ipv4s')
+    fetch_zone_ipv6s_calls = _recorded_calls('fetch_zone_ipv6s')
+    fetch_subdomain_ipv4s_calls = _recorded_calls('fetch_subdomain_ipv4s')
+    fetch_subdomain_ipv6s_calls = _recorded_calls('fetch_subdomain_ipv6s')
+    put_zone_ipv4s_calls = _recorded_calls('put_zone_ipv4s')
+    put_zone_ipv6s_calls = _recorded_calls('put_zone_ipv6s')
+    put_subdomain_ipv4_calls = _recorded_calls('put_subdomain_ipv4')
+    put_subdomain_ipv6s_calls = _recorded_calls('put_subdomain_ipv6s')
+
+    def _record(self, method: str, call):
+        """Record a call to the given method"""
+        self._calls.setdefault(method, []).append(call)
 
     def get_zones(self) -> List[str]:
         self.get_zones_call_count += 1
@@ -336,78 +470,58 @@ class MockTwoWayZoneUpdater(ruddr.TwoWayZoneUpdater):
     def fetch_zone_ipv4s(
         self, zone: str
     ) -> List[Tuple[str, ipaddress.IPv4Address, Optional[int]]]:
-        self.fetch_zone_ipv4s_calls.append(zone)
-        if self.fetch_zone_ipv4s_result is None:
-            raise NotImplementedError
-        result = self.fetch_zone_ipv4s_result[zone]
-        return raise_or_return(result)
+        self._record('fetch_zone_ipv4s', zone)
+        return dispatch_result(self.fetch_zone_ipv4s_result, zone)
 
     def fetch_zone_ipv6s(
         self, zone: str
     ) -> List[Tuple[str, ipaddress.IPv6Address, Optional[int]]]:
-        self.fetch_zone_ipv6s_calls.append(zone)
-        if self.fetch_zone_ipv6s_result is None:
-            raise NotImplementedError
-        result = self.fetch_zone_ipv6s_result[zone]
-        return raise_or_return(result)
+        self._record('fetch_zone_ipv6s', zone)
+        return dispatch_result(self.fetch_zone_ipv6s_result, zone)
 
     def fetch_subdomain_ipv4s(
         self, subdomain: str, zone: str
     ) -> List[Tuple[ipaddress.IPv4Address, Optional[int]]]:
-        self.fetch_subdomain_ipv4s_calls.append((subdomain, zone))
-        if self.fetch_subdomain_ipv4s_result is None:
-            raise NotImplementedError
-        result = self.fetch_subdomain_ipv4s_result[(subdomain, zone)]
-        return raise_or_return(result)
+        self._record('fetch_subdomain_ipv4s', (subdomain, zone))
+        return dispatch_result(self.fetch_subdomain_ipv4s_result,
+                               (subdomain, zone))
 
     def fetch_subdomain_ipv6s(
         self, subdomain: str, zone: str
     ) -> List[Tuple[ipaddress.IPv6Address, Optional[int]]]:
-        self.fetch_subdomain_ipv6s_calls.append((subdomain, zone))
-        if self.fetch_subdomain_ipv6s_result is None:
-            raise NotImplementedError
-        result = self.fetch_subdomain_ipv6s_result[(subdomain, zone)]
-        return raise_or_return(result)
+        self._record('fetch_subdomain_ipv6s', (subdomain, zone))
+        return dispatch_result(self.fetch_subdomain_ipv6s_result,
+                               (subdomain, zone))
 
     def put_zone_ipv4s(
         self,
         zone: str,
         records: Dict[str, Tuple[List[ipaddress.IPv4Address], Optional[int]]]
     ):
-        self.put_zone_ipv4s_calls.append((zone, records))
-        if self.put_zone_ipv4s_result is None:
-            raise NotImplementedError
-        result = self.put_zone_ipv4s_result[zone]
-        return raise_or_return(result)
+        self._record('put_zone_ipv4s', (zone, records))
+        return dispatch_result(self.put_zone_ipv4s_result, zone)
 
     def put_zone_ipv6s(
         self,
         zone: str,
         records: Dict[str, Tuple[List[ipaddress.IPv6Address], Optional[int]]]
     ):
-        self.put_zone_ipv6s_calls.append((zone, records))
-        if self.put_zone_ipv6s_result is None:
-            raise NotImplementedError
-        result = self.put_zone_ipv6s_result[zone]
-        return raise_or_return(result)
+        self._record('put_zone_ipv6s', (zone, records))
+        return dispatch_result(self.put_zone_ipv6s_result, zone)
 
     def put_subdomain_ipv4(self, subdomain: str, zone: str,
                            address: ipaddress.IPv4Address, ttl: Optional[int]):
-        self.put_subdomain_ipv4_calls.append((subdomain, zone, address, ttl))
-        if self.put_subdomain_ipv4_result is None:
-            raise NotImplementedError
-        result = self.put_subdomain_ipv4_result[(subdomain, zone)]
-        return raise_or_return(result)
+        self._record('put_subdomain_ipv4', (subdomain, zone, address, ttl))
+        return dispatch_result(self.put_subdomain_ipv4_result,
+                               (subdomain, zone))
 
     def put_subdomain_ipv6s(self, subdomain: str, zone: str,
                             addresses: List[ipaddress.IPv6Address],
                             ttl: Optional[int]):
-        self.put_subdomain_ipv6s_calls.append((subdomain, zone,
-                                               addresses, ttl))
-        if self.put_subdomain_ipv6s_result is None:
-            raise NotImplementedError
-        result = self.put_subdomain_ipv6s_result[(subdomain, zone)]
-        return raise_or_return(result)
+        self._record('put_subdomain_ipv6s',
+                     (subdomain, zone, addresses, ttl))
+        return dispatch_result(self.put_subdomain_ipv6s_result,
+                               (subdomain, zone))
 
 
 class MockTwoWayUpdater(ruddr.TwoWayUpdater):
@@ -426,12 +540,14 @@ class MockTwoWayUpdater(ruddr.TwoWayUpdater):
 
         self.fetch_all_ipv4s_result = fetch_all_ipv4s_result
         self.fetch_all_ipv6s_result = fetch_all_ipv6s_result
-        self.fetch_domain_ipv4s_result = fetch_domain_ipv4s_result
-        self.fetch_domain_ipv6s_result = fetch_domain_ipv6s_result
+        self.fetch_domain_ipv4s_result = result_table(
+            fetch_domain_ipv4s_result)
+        self.fetch_domain_ipv6s_result = result_table(
+            fetch_domain_ipv6s_result)
         self.put_all_ipv4s_result = put_all_ipv4s_result
         self.put_all_ipv6s_result = put_all_ipv6s_result
-        self.put_domain_ipv4_result = put_domain_ipv4_result
-        self.put_domain_ipv6s_result = put_domain_ipv6s_result
+        self.put_domain_ipv4_result = result_table(put_domain_ipv4_result)
+        self.put_domain_ipv6s_result = result_table(put_domain_ipv6s_result)
 
         self.fetch_all_ipv4s_count = 0
         self.fetch_all_ipv6s_count = 0
@@ -462,19 +578,13 @@ class MockTwoWayUpdater(ruddr.TwoWayUpdater):
         self, domain: str
     ) -> List[Tuple[ipaddress.IPv4Address, Optional[int]]]:
         self.fetch_domain_ipv4s_calls.append(domain)
-        if self.fetch_domain_ipv4s_result is None:
-            raise NotImplementedError
-        result = self.fetch_domain_ipv4s_result[domain]
-        return raise_or_return(result)
+        return dispatch_result(self.fetch_domain_ipv4s_result, domain)
 
     def fetch_domain_ipv6s(
         self, domain: str
     ) -> List[Tuple[ipaddress.IPv6Address, Optional[int]]]:
         self.fetch_domain_ipv6s_calls.append(domain)
-        if self.fetch_domain_ipv6s_result is None:
-            raise NotImplementedError
-        result = self.fetch_domain_ipv6s_result[domain]
-        return raise_or_return(result)
+        return dispatch_result(self.fetch_domain_ipv6s_result, domain)
 
     def put_all_ipv4s(
         self,
@@ -498,16 +608,10 @@ class MockTwoWayUpdater(ruddr.TwoWayUpdater):
                         address: ipaddress.IPv4Address,
                         ttl: Optional[int]):
         self.put_domain_ipv4_calls.append((domain, address, ttl))
-        if self.put_domain_ipv4_result is None:
-            raise NotImplementedError
-        result = self.put_domain_ipv4_result[domain]
-        return raise_or_return(result)
+        return dispatch_result(self.put_domain_ipv4_result, domain)
 
     def put_domain_ipv6s(self, domain: str,
                          addresses: List[ipaddress.IPv6Address],
                          ttl: Optional[int]):
         self.put_domain_ipv6s_calls.append((domain, addresses, ttl))
-        if self.put_domain_ipv6s_result is None:
-            raise NotImplementedError
-        result = self.put_domain_ipv6s_result[domain]
-        return raise_or_return(result)
+        return dispatch_result(self.put_domain_ipv6s_result, domain)
@@ -17,155 +17,152 @@
 import pytest
 import ipaddress
 
-import ruddr
-
-
-def test_require_and_skip_ipv4(notifier_factory):
-    """Test requiring IPv4 when skipped is error"""
-    with pytest.raises(ruddr.ConfigError):
-        notifier_factory(ipv4_required='true', skip_ipv4='true')
-
-
-def test_require_and_skip_ipv6(notifier_factory):
-    """Test requiring IPv6 when skipped is error"""
-    with pytest.raises(ruddr.ConfigError):
-        notifier_factory(ipv6_required='true', skip_ipv6='true')
-
-
-def test_require_ipv4_and_skip_ipv6(notifier_factory, mock_updater):
-    """Test requiring IPv4 when IPv6 skipped is okay"""
-    fake_notifier = notifier_factory(ipv4_required='true', skip_ipv6='true')
-    fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv4Address('10.20.30.40'),
-    ]
-
-
-def test_require_ipv6_and_skip_ipv4(notifier_factory, mock_updater):
-    """Test requiring IPv6 when IPv4 skipped is okay"""
-    fake_notifier = notifier_factory(ipv6_required='true', skip_ipv4='true')
-    fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv6Network('1234::/64'),
-    ]
-
-
-def test_ipv4_ready_false(notifier_factory, mock_updater):
-    """Test attaching updaters with ipv4_ready set to false is error"""
-    fake_notifier = notifier_factory(ipv4_ready='false')
-
-    # Expect no exception for IPv6
-    fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    with pytest.raises(ruddr.ConfigError):
-        fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-
-
-def test_ipv6_ready_false(notifier_factory, mock_updater):
-    """Test attaching updaters with ipv6_ready set to false is error"""
-    fake_notifier = notifier_factory(ipv6_ready='false')
-
-    # Expect no exception for IPv4
-    fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    with pytest.raises(ruddr.ConfigError):
-        fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-
-
-def test_ipv4_ready_false_attach_ipv6(notifier_factory, mock_updater):
-    """Test attaching only IPv6 updater with ipv4_ready set to false"""
-    fake_notifier = notifier_factory(ipv4_ready='false')
-    fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
-    # Well-written notifiers don't call notify_ipv4() when want_ipv4() is False
-
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv6Network('1234::/64'),
-        ipaddress.IPv6Network('5678::/64'),
-    ]
-
-
-def test_ipv6_ready_false_attach_ipv4(notifier_factory, mock_updater):
-    """Test attaching only IPv4 updater with ipv6_ready set to false"""
-    fake_notifier = notifier_factory(ipv6_ready='false')
-    fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('50.60.70.80'))
-    # Well-written notifiers don't call notify_ipv6() when want_ipv6() is False
-
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv4Address('10.20.30.40'),
-        ipaddress.IPv4Address('50.60.70.80'),
-    ]
-
-
-def test_want_ipv4_false(notifier_factory, mock_updater):
-    """Test want_ipv4 is true when ipv4 update function not attached"""
-    fake_notifier = notifier_factory()
-    assert not fake_notifier.want_ipv4()
-
-
-def test_want_ipv4_true(notifier_factory, mock_updater):
-    """Test want_ipv4 is true when ipv4 update function attached"""
-    fake_notifier = notifier_factory()
-    fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    assert fake_notifier.want_ipv4()
-
-
-def test_want_ipv6_false(notifier_factory, mock_updater):
-    """Test want_ipv6 is true when ipv6 update function not attached"""
-    fake_notifier = notifier_factory()
-    assert not fake_notifier.want_ipv6()
-
-
-def test_want_ipv6_true(notifier_factory, mock_updater):
-    """Test want_ipv6 is true when ipv6 update function attached"""
-    fake_notifier = notifier_factory()
-    fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert fake_notifier.want_ipv6()
-
-
-def test_need_ipv4_false_not_required(notifier_factory, mock_updater):
-    """Test need_ipv4 is false when updater attached but not required"""
-    fake_notifier = notifier_factory(ipv4_required='false')
-    fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    assert not fake_notifier.need_ipv4()
-
-
-def test_need_ipv4_false_no_updater(notifier_factory, mock_updater):
-    """Test need_ipv4 is false when required but no updater attached"""
-    fake_notifier = notifier_factory(ipv4_required='true')
-    assert not fake_notifier.need_ipv4()
-
-
-def test_need_ipv4_true(notifier_factory, mock_updater):
-    """Test need_ipv4 is true when required and updater attached"""
-    fake_notifier = notifier_factory(ipv4_required='true')
-    fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    assert fake_notifier.need_ipv4()
-
-
-def test_need_ipv6_false_not_required(notifier_factory, mock_updater):
-    """Test need_ipv6 is false when updater attached but not required"""
-    fake_notifier = notifier_factory(ipv6_required='false')
-    fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert not fake_notifier.need_ipv6()
-
-
-def test_need_ipv6_false_no_updater(notifier_factory, mock_updater):
-    """Test need_ipv6 is false when required but no updater attached"""
-    fake_notifier = notifier_factory(ipv6_required='true')
-    assert not fake_notifier.need_ipv6()
-
-
-def test_need_ipv6_true(notifier_factory, mock_updater):
-    """Test need_ipv6 is true when required and updater attached"""
-    fake_notifier = notifier_factory(ipv6_required='true')
-    fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert fake_notifier.need_ipv6()
+from ruddr import ConfigError
+
+# Addresses used throughout. These are immutable, so sharing them is safe.
+_V4_A = ipaddress.IPv4Address('10.20.30.40')
+_V4_B = ipaddress.IPv4Address('50.60.70.80')
+_V6_A = ipaddress.IPv6Network('1234::/64')
+_V6_B = ipaddress.IPv6Network('5678::/64')
+# Expected lists are built once as well. Updaters receive the same objects
+# that were notified, so list comparison short-circuits on identity.
+_V4_PAIR = [_V4_A, _V4_B]
+_V6_PAIR = [_V6_A, _V6_B]
+
+
+def _attach(notifier, updater, family: str) -> bool:
+    """Attach the updater to the notifier for the given family ('ipv4' or
+    'ipv6') and return the result of attaching"""
+    attach_func = getattr(notifier, f'attach_{family}_updater')
+    return attach_func(getattr(updater, f'update_{family}'))
+
+
+@pytest.mark.parametrize('config', [
+    pytest.param(dict(ipv4_required='true', skip_ipv4='true'),
+                 id='require_and_skip_ipv4'),
+    pytest.param(dict(ipv6_required='true', skip_ipv6='true'),
+                 id='require_and_skip_ipv6'),
+    pytest.param(dict(skip_ipv4='true', skip_ipv6='true'),
+                 id='skip_both'),
+])
+def test_config_error(notifier_factory, config):
+    """Test invalid combinations of config options are errors"""
+    with pytest.raises(ConfigError):
+        notifier_factory(**config)
+
+
+@pytest.mark.parametrize(('config', 'attach', 'notify', 'published'), [
+    # config: notifier config
+    # attach: {family: expected return value} for each updater attached
+    # notify: addresses to notify, in order
+    # published: addresses the updater should receive
+    #
+    # Well-behaved notifiers wouldn't notify for a family when want_ipv4() or
+    # want_ipv6() is false (especially when it isn't ready), but it must not
+    # cause problems
+    pytest.param(dict(ipv4_required='true', skip_ipv6='true'),
+                 {'ipv4': True},
+                 [_V4_A],
+                 [_V4_A],
+                 id='require_ipv4_and_skip_ipv6'),
+    pytest.param(dict(ipv6_required='true', skip_ipv4='true'),
+                 {'ipv6': True},
+                 [_V6_A],
+                 [_V6_A],
+                 id='require_ipv6_and_skip_ipv4'),
+    pytest.param(dict(ipv4_ready='false'),
+                 {'ipv6': True},
+                 _V6_PAIR,
+                 _V6_PAIR,
+                 id='ipv4_ready_false_attach_ipv6'),
+    pytest.param(dict(ipv6_ready='false'),
+                 {'ipv4': True},
+                 _V4_PAIR,
+                 _V4_PAIR,
+                 id='ipv6_ready_false_attach_ipv4'),
+    pytest.param(dict(skip_ipv4='true'),
+                 {'ipv4': False, 'ipv6': True},
+                 _V4_PAIR + _V6_PAIR,
+                 _V6_PAIR,
+                 id='skip_ipv4_attach_both'),
+    pytest.param(dict(skip_ipv6='true'),
+                 {'ipv4': True, 'ipv6': False},
+                 _V4_PAIR + _V6_PAIR,
+                 _V4_PAIR,
+                 id='skip_ipv6_attach_both'),
+    pytest.param(dict(skip_ipv4='true', ipv4_ready='false'),
+                 {'ipv4': False, 'ipv6': True},
+                 _V4_PAIR + _V6_PAIR,
+                 _V6_PAIR,
+                 id='ipv4_ready_false_and_skipped'),
+    pytest.param(dict(skip_ipv6='true', ipv6_ready='false'),
+                 {'ipv4': True, 'ipv6': False},
+                 _V4_PAIR + _V6_PAIR,
+                 _V4_PAIR,
+                 id='ipv6_ready_false_and_skipped'),
+])
+def test_notify_routing(notifier_factory, mock_updater,
+                        config, attach, notify, published):
+    """Test which updaters get attached and which notifications reach them
+    for various combinations of skipped and unready address families"""
+    fake_notifier = notifier_factory(**config)
+    for family, expected in attach.items():
+        assert _attach(fake_notifier, mock_updater, family) == expected
+
+    for address in notify:
+        if isinstance(address, ipaddress.IPv4Address):
+            fake_notifier.notify_ipv4(address)
+        else:
+            fake_notifier.notify_ipv6(address)
+
+    assert mock_updater.published_addresses == published
+
+
+@pytest.mark.parametrize(('family', 'other'), [
+    ('ipv4', 'ipv6'),
+    ('ipv6', 'ipv4'),
+])
+def test_ready_false(notifier_factory, mock_updater, family, other):
+    """Test attaching updaters with ipv4_ready/ipv6_ready set to false is an
+    error for that family only"""
+    fake_notifier = notifier_factory(**{f'{family}_ready': 'false'})
+
+    # Expect no exception for the other family
+    _attach(fake_notifier, mock_updater, other)
+    with pytest.raises(ConfigError):
+        _attach(fake_notifier, mock_updater, family)
+
+
+@pytest.mark.parametrize(('config', 'attach', 'predicate', 'expected'), [
+    # config: notifier config
+    # attach: families to attach an updater for
+    # predicate: notifier method to check
+    # expected: what it should return
+    pytest.param({}, (), 'want_ipv4', False, id='want_ipv4_false'),
+    pytest.param({}, ('ipv4',), 'want_ipv4', True, id='want_ipv4_true'),
+    pytest.param({}, (), 'want_ipv6', False, id='want_ipv6_false'),
+    pytest.param({}, ('ipv6',), 'want_ipv6', True, id='want_ipv6_true'),
+    pytest.param(dict(ipv4_required='false'), ('ipv4',), 'need_ipv4', False,
+                 id='need_ipv4_false_not_required'),
+    pytest.param(dict(ipv4_required='true'), (), 'need_ipv4', False,
+                 id='need_ipv4_false_no_updater'),
+    pytest.param(dict(ipv4_required='true'), ('ipv4',), 'need_ipv4', True,
+                 id='need_ipv4_true'),
+    pytest.param(dict(ipv6_required='false'), ('ipv6',), 'need_ipv6', False,
+                 id='need_ipv6_false_not_required'),
+    pytest.param(dict(ipv6_required='true'), (), 'need_ipv6', False,
+                 id='need_ipv6_false_no_updater'),
+    pytest.param(dict(ipv6_required='true'), ('ipv6',), 'need_ipv6', True,
+                 id='need_ipv6_true'),
+])
+def test_want_need(notifier_factory, mock_updater,
+                   config, attach, predicate, expected):
+    """Test want_ipv4/want_ipv6 are true only with an updater attached, and
+    need_ipv4/need_ipv6 only when also required"""
+    fake_notifier = notifier_factory(**config)
+    for family in attach:
+        _attach(fake_notifier, mock_updater, family)
+    assert getattr(fake_notifier, predicate)() is expected
 
 
 def test_defaults(notifier_factory, mock_updater):
@@ -180,122 +177,24 @@ def test_defaults(notifier_factory, mock_updater):
     assert not fake_notifier.need_ipv6()
 
 
-def test_skip_ipv4_attach_ipv4(notifier_factory, mock_updater):
-    """Test attaching an updater for IPv4 and notifying when IPv4 is skipped
-    does nothing"""
-    fake_notifier = notifier_factory(skip_ipv4='true')
-    attached4 = fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    assert not attached4
-    assert not fake_notifier.want_ipv4()
-    # Well-behaved notifiers wouldn't notify_ipv4 when want_ipv4 is false, but
-    # it must not cause problems
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('50.60.70.80'))
-    assert mock_updater.published_addresses == []
-
-
-def test_skip_ipv4_attach_both(notifier_factory, mock_updater):
-    """Test attaching an updater when IPv4 is skipped works for IPv6"""
-    fake_notifier = notifier_factory(skip_ipv4='true')
-    attached4 = fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    attached6 = fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert not attached4
-    assert attached6
-    # Well-behaved notifiers wouldn't notify_ipv4 when want_ipv4 is false, but
-    # it must not cause problems
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('50.60.70.80'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
-
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv6Network('1234::/64'),
-        ipaddress.IPv6Network('5678::/64'),
-    ]
-
-
-def test_skip_ipv6_attach_ipv6(notifier_factory, mock_updater):
-    """Test attaching an updater for IPv6 and notifying when IPv6 is skipped
-    does nothing"""
-    fake_notifier = notifier_factory(skip_ipv6='true')
-    attached6 = fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert not attached6
-    assert not fake_notifier.want_ipv6()
-    # Well-behaved notifiers wouldn't notify_ipv6 when want_ipv6 is false, but
-    # it must not cause problems
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
+@pytest.mark.parametrize(('family', 'addresses'), [
+    pytest.param('ipv4', _V4_PAIR, id='ipv4'),
+    pytest.param('ipv6', _V6_PAIR, id='ipv6'),
+])
+def test_skip_attach(notifier_factory, mock_updater, family, addresses):
+    """Test attaching an updater for a skipped address family and notifying
+    for it does nothing"""
+    fake_notifier = notifier_factory(**{f'skip_{family}': 'true'})
+    assert not _attach(fake_notifier, mock_updater, family)
+    assert not getattr(fake_notifier, f'want_{family}')()
+    # Well-behaved notifiers wouldn't notify when want_ipv4/want_ipv6 is
+    # false, but it must not cause problems
+    notify = getattr(fake_notifier, f'notify_{family}')
+    for address in addresses:
+        notify(address)
     assert mock_updater.published_addresses == []
 
 
-def test_skip_ipv6_attach_both(notifier_factory, mock_updater):
-    """Test attaching an updater when IPv6 is skipped works for IPv4"""
-    fake_notifier = notifier_factory(skip_ipv6='true')
-    attached4 = fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    attached6 = fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert attached4
-    assert not attached6
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('50.60.70.80'))
-    # Well-behaved notifiers wouldn't notify_ipv6 when want_ipv6 is false, but
-    # it must not cause problems
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
-
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv4Address('10.20.30.40'),
-        ipaddress.IPv4Address('50.60.70.80'),
-    ]
-
-
-def test_ipv4_ready_false_and_skipped(notifier_factory, mock_updater):
-    """Test attaching updater with ipv4_ready set to false but IPv4 skipped
-    does not raise error"""
-    fake_notifier = notifier_factory(skip_ipv4='true', ipv4_ready='false')
-    attached4 = fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    attached6 = fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert not attached4
-    assert attached6
-    # Well-behaved notifiers wouldn't notify_ipv4 when want_ipv4 is false
-    # (especially when IPv4 isn't ready), but it must not cause problems
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('50.60.70.80'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
-
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv6Network('1234::/64'),
-        ipaddress.IPv6Network('5678::/64'),
-    ]
-
-
-def test_ipv6_ready_false_and_skipped(notifier_factory, mock_updater):
-    """Test attaching updater with ipv6_ready set to false but IPv6 skipped
-    does not raise error"""
-    fake_notifier = notifier_factory(skip_ipv6='true', ipv6_ready='false')
-    attached4 = fake_notifier.attach_ipv4_updater(mock_updater.update_ipv4)
-    attached6 = fake_notifier.attach_ipv6_updater(mock_updater.update_ipv6)
-    assert attached4
-    assert not attached6
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('50.60.70.80'))
-    # Well-behaved notifiers wouldn't notify_ipv6 when want_ipv6 is false
-    # (especially when IPv6 isn't ready), but it must not cause problems
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
-
-    assert mock_updater.published_addresses == [
-        ipaddress.IPv4Address('10.20.30.40'),
-        ipaddress.IPv4Address('50.60.70.80'),
-    ]
-
-
-def test_skip_both_error(notifier_factory):
-    """Test that setting both skip_ipv4 and skip_ipv6 causes an exception"""
-    with pytest.raises(ruddr.ConfigError):
-        notifier_factory(skip_ipv4='true', skip_ipv6='true')
-
-
 def test_multiple_updaters(notifier_factory, updater_factory):
     """Test multiple updaters attached to a single notifier"""
     fake_notifier = notifier_factory()
@@ -306,21 +205,11 @@ def test_multiple_updaters(notifier_factory, updater_factory):
     fake_notifier.attach_ipv4_updater(mock_updater_2.update_ipv4)
     fake_notifier.attach_ipv6_updater(mock_updater_2.update_ipv6)
 
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('10.20.30.40'))
-    fake_notifier.notify_ipv4(ipaddress.IPv4Address('50.60.70.80'))
-    fake_notifier.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
-
-    assert mock_updater_1.published_addresses == [
-        ipaddress.IPv6Network('1234::/64'),
-        ipaddress.IPv4Address('10.20.30.40'),
-        ipaddress.IPv4Address('50.60.70.80'),
-        ipaddress.IPv6Network('5678::/64'),
-    ]
+    fake_notifier.notify_ipv6(_V6_A)
+    fake_notifier.notify_ipv4(_V4_A)
+    fake_notifier.notify_ipv4(_V4_B)
+    fake_notifier.notify_ipv6(_V6_B)
 
-    assert mock_updater_2.published_addresses == [
-        ipaddress.IPv6Network('1234::/64'),
-        ipaddress.IPv4Address('10.20.30.40'),
-        ipaddress.IPv4Address('50.60.70.80'),
-        ipaddress.IPv6Network('5678::/64'),
-    ]
+    expected = [_V6_A, _V4_A, _V4_B, _V6_B]
+    assert mock_updater_1.published_addresses == expected
+    assert mock_updater_2.published_addresses == expected
@@ -222,107 +222,110 @@ def test_config_not_override_zero_success_interval(advance):
 
 # Sequence is list of checks as tuples (successful, on_demand, interval_after)
 # on_demand is ignored for the initial check
-@pytest.mark.parametrize("sequence,polling", [
+_SEQUENCES = (
     # === Non-polling tests ===
     # setup, initial check, teardown
-    ([
+    pytest.param((
         (True, False, 10),
-     ], False),
+    ), False, id='ok'),
     # setup, initial check, on demand check, teardown
-    ([
-         (True, False, 10),
-         (True, True, 10),
-     ], False),
+    pytest.param((
+        (True, False, 10),
+        (True, True, 10),
+    ), False, id='ok-on_demand'),
     # setup, initial check fails, retry succeeds, teardown
-    ([
-         (False, False, 1),
-         (True, False, 10),
-     ], False),
+    pytest.param((
+        (False, False, 1),
+        (True, False, 10),
+    ), False, id='retry-ok'),
     # setup, initial check fails, on demand check before retry, retry doesn't
     # happen, teardown
-    ([
-         (False, False, 0.5),
-         (True, True, 10),
-     ], False),
+    pytest.param((
+        (False, False, 0.5),
+        (True, True, 10),
+    ), False, id='on_demand_before_retry'),
     # setup, initial check fails, next check fails, next check passes, teardown
-    ([
-         (False, False, 1),
-         (False, False, 2),
-         (True, False, 10),
-     ], False),
+    pytest.param((
+        (False, False, 1),
+        (False, False, 2),
+        (True, False, 10),
+    ), False, id='retry2-ok'),
     # setup, initial check fails, next check fails, on demand check fails but
     # short timeout again, then teardown
-    ([
-         (False, False, 1),
-         (False, False, 1.5),
-         (False, True, 1),
-         (True, False, 10),
-     ], False),
+    pytest.param((
+        (False, False, 1),
+        (False, False, 1.5),
+        (False, True, 1),
+        (True, False, 10),
+    ), False, id='retry-on_demand_fails-ok'),
 
     # === Polling tests ===
     # setup, initial check, on demand check, scheduled check, teardown, no more
     # check
-    ([
-         (True, False, 6),
-         (True, True, 7),
-         (True, False, 6),
-     ], True),
+    pytest.param((
+        (True, False, 6),
+        (True, True, 7),
+        (True, False, 6),
+    ), True, id='polling-on_demand-scheduled'),
     # setup, initial check, scheduled check, teardown, no more check
-    ([
-         (True, False, 7),
-         (True, False, 6),
-     ], True),
+    pytest.param((
+        (True, False, 7),
+        (True, False, 6),
+    ), True, id='polling-scheduled'),
     # setup, initial check fails, retry succeeds, scheduled check, teardown
-    ([
-         (False, False, 1),
-         (True, False, 7),
-         (True, False, 6),
-     ], True),
+    pytest.param((
+        (False, False, 1),
+        (True, False, 7),
+        (True, False, 6),
+    ), True, id='polling-retry-ok-scheduled'),
     # setup, initial check, scheduled check fails, retry succeeds, scheduled
     # check, teardown
-    ([
-         (True, False, 7),
-         (False, False, 1),
-         (True, False, 7),
-         (True, False, 6),
-     ], True),
+    pytest.param((
+        (True, False, 7),
+        (False, False, 1),
+        (True, False, 7),
+        (True, False, 6),
+    ), True, id='polling-scheduled_fails-retry-ok'),
     # setup, initial check fails, retry succeeds, on demand check, scheduled
     # check, teardown
-    ([
-         (False, False, 1),
-         (True, False, 6),
-         (True, True, 7),
-         (True, False, 6),
-     ], True),
+    pytest.param((
+        (False, False, 1),
+        (True, False, 6),
+        (True, True, 7),
+        (True, False, 6),
+    ), True, id='polling-retry-ok-on_demand-scheduled'),
     # setup, initial check fails, retry fails 3 times, retry succeeds,
     # scheduled check, teardown
-    ([
-         (False, False, 1),
-         (False, False, 2),
-         (False, False, 4),
-         (False, False, 5),
-         (True, False, 7),
-         (True, False, 6),
-     ], True),
+    pytest.param((
+        (False, False, 1),
+        (False, False, 2),
+        (False, False, 4),
+        (False, False, 5),
+        (True, False, 7),
+        (True, False, 6),
+    ), True, id='polling-retry4-then-ok'),
     # setup, initial check fails, retry fails 4 times, teardown, no more check
-    ([
-         (False, False, 1),
-         (False, False, 2),
-         (False, False, 4),
-         (False, False, 5),
-         (False, False, 4),
-     ], True),
+    pytest.param((
+        (False, False, 1),
+        (False, False, 2),
+        (False, False, 4),
+        (False, False, 5),
+        (False, False, 4),
+    ), True, id='polling-retry4-stop'),
     # setup, initial check fails, fails twice more, on demand check fails,
     # retry after minimum delay fails, retry succeeds, teardown
-    ([
-         (False, False, 1),
-         (False, False, 2),
-         (False, False, 3),
-         (False, True, 1),
-         (False, False, 2),
-         (True, False, 6),
-     ], True),
-])
+    pytest.param((
+        (False, False, 1),
+        (False, False, 2),
+        (False, False, 3),
+        (False, True, 1),
+        (False, False, 2),
+        (True, False, 6),
+    ), True, id='polling-retry-on_demand_fails-ok'),
+)
+
+
+@pytest.mark.parametrize(('sequence', 'polling'), _SEQUENCES)
 def test_notifier_sequence(sequence, polling, advance):
     notifier = doubles.MockNotifier(
         'mock_notifier',
@@ -16,314 +16,183 @@
 
 """Tests for Addrfile"""
 import ipaddress
+import itertools
 
 import pytest
 
 import doubles
 import ruddr.addrfile
 
+# Addresses used throughout. These are immutable, so sharing them is safe.
+_A4_1234 = ipaddress.IPv4Address('1.2.3.4')
+_A4_2345 = ipaddress.IPv4Address('2.3.4.5')
+_A4_5678 = ipaddress.IPv4Address('5.6.7.8')
+_A4_6789 = ipaddress.IPv4Address('6.7.8.9')
+_N6_1234 = ipaddress.IPv6Network('1234::/64')
+_N6_2345 = ipaddress.IPv6Network('2345::/64')
+_N6_5678 = ipaddress.IPv6Network('5678::/64')
+_N6_6789 = ipaddress.IPv6Network('6789::/64')
+# Never stored by any test, so an update is always needed for these
+_A4_OTHER = ipaddress.IPv4Address('9.8.7.6')
+_N6_OTHER = ipaddress.IPv6Network('9876::/64')
+
+
+@pytest.fixture(scope='module')
+def addrfile_factory(tmp_path_factory):
+    # One directory for the whole module. Every addrfile gets a unique name,
+    # so tests still never share a file.
+    directory = tmp_path_factory.mktemp('addrfiles')
+    counter = itertools.count(1)
+
+    def factory(contents: str):
+        path = directory / f"addrfile_{next(counter)}"
+        path.write_text(''.join(f"{line.strip()}\n"
+                                for line in contents.splitlines()))
+        return ruddr.addrfile.Addrfile(path)
+    return factory
+
 
 @pytest.fixture
-def addrfile_factory(tmp_path):
-    count = 0
+def prepared_addrfile(request, addrfile_factory):
+    """Fixture creating an :class:`~ruddr.Addrfile` from the contents given
+    by indirect parametrization"""
+    return addrfile_factory(request.param)
 
-    def factory(contents: str):
-        nonlocal count
-        count += 1
-        path = tmp_path / f"addrfile_{count}"
 
-        with open(path, "w") as f:
-            for line in contents.splitlines():
-                print(line.strip(), file=f)
+def _assert_state(addrfile, name, ipv4=(None, False), ipv6=(None, False)):
+    """Assert the addrfile holds the given (address, is_current) tuples for
+    the named updater, and needs an update except for current addresses"""
+    assert addrfile.get_ipv4(name) == ipv4
+    assert addrfile.get_ipv6(name) == ipv6
 
-        return ruddr.addrfile.Addrfile(path)
-    return factory
+    address, current = ipv4
+    if address is not None:
+        assert bool(addrfile.needs_ipv4_update(name, address)) != current
+    assert addrfile.needs_ipv4_update(name, _A4_OTHER)
+
+    prefix, current = ipv6
+    if prefix is not None:
+        assert bool(addrfile.needs_ipv6_update(name, prefix)) != current
+    assert addrfile.needs_ipv6_update(name, _N6_OTHER)
 
 
 def test_new_addrfile(empty_addrfile):
     """Test new, nonexistent addrfile can get and set addresses"""
-    assert empty_addrfile.get_ipv4("test") == (None, False)
-    assert empty_addrfile.get_ipv6("test") == (None, False)
-    assert empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-
-    empty_addrfile.set_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
-    empty_addrfile.set_ipv6("test", ipaddress.IPv6Network('1234::/64'))
-    assert (empty_addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (empty_addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
-
-    empty_addrfile.set_ipv4("test2", ipaddress.IPv4Address('1.2.3.4'))
-    empty_addrfile.set_ipv6("test2", ipaddress.IPv6Network('1234::/64'))
-    assert (empty_addrfile.get_ipv4("test2") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (empty_addrfile.get_ipv6("test2") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not empty_addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not empty_addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('1234::/64')
-    )
-    assert empty_addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('5678::/64')
-    )
+    _assert_state(empty_addrfile, "test")
+
+    empty_addrfile.set_ipv4("test", _A4_1234)
+    empty_addrfile.set_ipv6("test", _N6_1234)
+    _assert_state(empty_addrfile, "test", (_A4_1234, True), (_N6_1234, True))
+
+    empty_addrfile.set_ipv4("test2", _A4_1234)
+    empty_addrfile.set_ipv6("test2", _N6_1234)
+    _assert_state(empty_addrfile, "test2", (_A4_1234, True), (_N6_1234, True))
 
 
 def test_existing_addrfile(empty_addrfile):
     """Test getting addresses from existing addrfile"""
-    empty_addrfile.set_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
-    empty_addrfile.set_ipv6("test", ipaddress.IPv6Network('1234::/64'))
-    empty_addrfile.invalidate_ipv4("test2", ipaddress.IPv4Address('5.6.7.8'))
-    empty_addrfile.invalidate_ipv6("test2", ipaddress.IPv6Network('5678::/64'))
+    empty_addrfile.set_ipv4("test", _A4_1234)
+    empty_addrfile.set_ipv6("test", _N6_1234)
+    empty_addrfile.invalidate_ipv4("test2", _A4_5678)
+    empty_addrfile.invalidate_ipv6("test2", _N6_5678)
     path = empty_addrfile.path
 
     addrfile = ruddr.addrfile.Addrfile(path)
-    assert (addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
-    addrfile.invalidate_ipv4("test", ipaddress.IPv4Address('2.3.4.5'))
-    addrfile.invalidate_ipv6("test", ipaddress.IPv6Network('2345::/64'))
-    assert (addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('2.3.4.5'), False))
-    assert (addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('2345::/64'), False))
-    assert addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('2.3.4.5')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('2345::/64')
-    )
-
-    assert (addrfile.get_ipv4("test2") ==
-            (ipaddress.IPv4Address('5.6.7.8'), False))
-    assert (addrfile.get_ipv6("test2") ==
-            (ipaddress.IPv6Network('5678::/64'), False))
-    assert addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('5678::/64')
-    )
-    assert addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('1234::/64')
-    )
-    addrfile.set_ipv4("test2", ipaddress.IPv4Address('6.7.8.9'))
-    addrfile.set_ipv6("test2", ipaddress.IPv6Network('6789::/64'))
-    assert (addrfile.get_ipv4("test2") ==
-            (ipaddress.IPv4Address('6.7.8.9'), True))
-    assert (addrfile.get_ipv6("test2") ==
-            (ipaddress.IPv6Network('6789::/64'), True))
-    assert not addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('6.7.8.9')
-    )
-    assert not addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('6789::/64')
-    )
+    _assert_state(addrfile, "test", (_A4_1234, True), (_N6_1234, True))
+    addrfile.invalidate_ipv4("test", _A4_2345)
+    addrfile.invalidate_ipv6("test", _N6_2345)
+    _assert_state(addrfile, "test", (_A4_2345, False), (_N6_2345, False))
+
+    _assert_state(addrfile, "test2", (_A4_5678, False), (_N6_5678, False))
+    addrfile.set_ipv4("test2", _A4_6789)
+    addrfile.set_ipv6("test2", _N6_6789)
+    _assert_state(addrfile, "test2", (_A4_6789, True), (_N6_6789, True))
 
 
 def test_only_ipv4_is_set(empty_addrfile):
     """Test getting addresses when only IPv4 is set"""
-    empty_addrfile.set_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
-    empty_addrfile.invalidate_ipv4("test2", ipaddress.IPv4Address('5.6.7.8'))
+    empty_addrfile.set_ipv4("test", _A4_1234)
+    empty_addrfile.invalidate_ipv4("test2", _A4_5678)
     path = empty_addrfile.path
 
     addrfile = ruddr.addrfile.Addrfile(path)
-    assert (addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert addrfile.get_ipv6("test") == (None, False)
-    assert not empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
-
-    assert (addrfile.get_ipv4("test2") ==
-            (ipaddress.IPv4Address('5.6.7.8'), False))
-    assert addrfile.get_ipv6("test2") == (None, False)
-    assert empty_addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('5678::/64')
-    )
-    assert empty_addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('1.2.3.4')
-    )
+    _assert_state(addrfile, "test", ipv4=(_A4_1234, True))
+    _assert_state(addrfile, "test2", ipv4=(_A4_5678, False))
 
 
 def test_only_ipv6_is_set(empty_addrfile):
     """Test getting addresses when only IPv6 is set"""
-    empty_addrfile.set_ipv6("test", ipaddress.IPv6Network('1234::/64'))
-    empty_addrfile.invalidate_ipv6("test2", ipaddress.IPv6Network('5678::/64'))
+    empty_addrfile.set_ipv6("test", _N6_1234)
+    empty_addrfile.invalidate_ipv6("test2", _N6_5678)
     path = empty_addrfile.path
 
     addrfile = ruddr.addrfile.Addrfile(path)
-    assert addrfile.get_ipv4("test") == (None, False)
-    assert (addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
-
-    assert addrfile.get_ipv4("test2") == (None, False)
-    assert (addrfile.get_ipv6("test2") ==
-            (ipaddress.IPv6Network('5678::/64'), False))
-    assert empty_addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('5678::/64')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('1234::/64')
-    )
+    _assert_state(addrfile, "test", ipv6=(_N6_1234, True))
+    _assert_state(addrfile, "test2", ipv6=(_N6_5678, False))
 
 
 def test_set_ipv4_invalidate_ipv6(empty_addrfile):
     """Test getting addresses when IPv4 is set successfully and IPv6 is
     invalidated"""
-    empty_addrfile.set_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
-    empty_addrfile.invalidate_ipv6("test", ipaddress.IPv6Network('1234::/64'))
+    empty_addrfile.set_ipv4("test", _A4_1234)
+    empty_addrfile.invalidate_ipv6("test", _N6_1234)
     path = empty_addrfile.path
 
     addrfile = ruddr.addrfile.Addrfile(path)
-    assert (addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), False))
-    assert not empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
+    _assert_state(addrfile, "test", (_A4_1234, True), (_N6_1234, False))
 
 
 def test_set_ipv6_invalidate_ipv4(empty_addrfile):
     """Test getting addresses when IPv6 is set successfully and IPv4 is
     invalidated"""
-    empty_addrfile.invalidate_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
-    empty_addrfile.set_ipv6("test", ipaddress.IPv6Network('1234::/64'))
+    empty_addrfile.invalidate_ipv4("test", _A4_1234)
+    empty_addrfile.set_ipv6("test", _N6_1234)
     path = empty_addrfile.path
 
     addrfile = ruddr.addrfile.Addrfile(path)
-    assert (addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), False))
-    assert (addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert empty_addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert empty_addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
+    _assert_state(addrfile, "test", (_A4_1234, False), (_N6_1234, True))
 
 
 def test_read_error(mocker, tmp_path):
     """Test read error in addrfile"""
     mocker.patch('builtins.open', return_value=doubles.BrokenFile())
     addrfile = ruddr.addrfile.Addrfile(tmp_path / 'addrfile')
+    _assert_state(addrfile, "test")
 
-    assert addrfile.get_ipv4("test") == (None, False)
-    assert addrfile.get_ipv6("test") == (None, False)
-    assert addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
 
-
-def test_set_ipv4_write_error(mocker, tmp_path):
-    """Test write errors for set_ipv4"""
+@pytest.fixture
+def broken_addrfile(mocker, tmp_path):
+    """Fixture creating an :class:`~ruddr.Addrfile` whose writes fail"""
     mocker.patch('builtins.open',
                  return_value=doubles.BrokenFile(write_broken=True))
-    addrfile = ruddr.addrfile.Addrfile(tmp_path / 'addrfile')
+    return ruddr.addrfile.Addrfile(tmp_path / 'addrfile')
+
+
+def test_set_ipv4_write_error(broken_addrfile):
+    """Test write errors for set_ipv4"""
     with pytest.raises(OSError):
-        addrfile.set_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
+        broken_addrfile.set_ipv4("test", _A4_1234)
 
 
-def test_set_ipv6_write_error(mocker, tmp_path):
+def test_set_ipv6_write_error(broken_addrfile):
     """Test write errors for set_ipv6"""
-    mocker.patch('builtins.open',
-                 return_value=doubles.BrokenFile(write_broken=True))
-    addrfile = ruddr.addrfile.Addrfile(tmp_path / 'addrfile')
     with pytest.raises(OSError):
-        addrfile.set_ipv6("test", ipaddress.IPv6Network('1234::/64'))
+        broken_addrfile.set_ipv6("test", _N6_1234)
 
 
-def test_invalidate_ipv4_write_error(mocker, tmp_path):
+def test_invalidate_ipv4_write_error(broken_addrfile):
     """Test write errors for invalidate_ipv4"""
-    mocker.patch('builtins.open',
-                 return_value=doubles.BrokenFile(write_broken=True))
-    addrfile = ruddr.addrfile.Addrfile(tmp_path / 'addrfile')
     with pytest.raises(OSError):
-        addrfile.invalidate_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
+        broken_addrfile.invalidate_ipv4("test", _A4_1234)
 
 
-def test_invalidate_ipv6_write_error(mocker, tmp_path):
+def test_invalidate_ipv6_write_error(broken_addrfile):
     """Test write errors for invalidate_ipv6"""
-    mocker.patch('builtins.open',
-                 return_value=doubles.BrokenFile(write_broken=True))
-    addrfile = ruddr.addrfile.Addrfile(tmp_path / 'addrfile')
     with pytest.raises(OSError):
-        addrfile.invalidate_ipv6("test", ipaddress.IPv6Network('1234::/64'))
+        broken_addrfile.invalidate_ipv6("test", _N6_1234)
 
 
-@pytest.mark.parametrize('contents', [
+@pytest.mark.parametrize('prepared_addrfile', [
     '',
     '["1.2.3.4"]',
     '{}',
@@ -333,59 +202,24 @@ def test_invalidate_ipv6_write_error(mocker, tmp_path):
     'null',
     '"1.2.3.4"',
     'invalid json',
-])
-def test_not_filled_json_object(addrfile_factory, contents):
+], indirect=True)
+def test_not_filled_json_object(prepared_addrfile):
     """Test reading an addrfile that's not JSON, a JSON non-object type, or is
     an empty JSON object"""
-    addrfile = addrfile_factory(contents)
-    assert addrfile.get_ipv4("test") == (None, False)
-    assert addrfile.get_ipv6("test") == (None, False)
-    assert addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-
-    addrfile.set_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
-    addrfile.set_ipv6("test", ipaddress.IPv6Network('1234::/64'))
-    assert (addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
+    addrfile = prepared_addrfile
+    _assert_state(addrfile, "test")
+
+    addrfile.set_ipv4("test", _A4_1234)
+    addrfile.set_ipv6("test", _N6_1234)
+    _assert_state(addrfile, "test", (_A4_1234, True), (_N6_1234, True))
 
     addrfile2 = ruddr.addrfile.Addrfile(addrfile.path)
-    assert (addrfile2.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile2.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not addrfile2.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not addrfile2.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert addrfile2.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile2.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
-
-
-@pytest.mark.parametrize('contents', [
+    _assert_state(addrfile2, "test", (_A4_1234, True), (_N6_1234, True))
+
+
+# Addrfile contents with one malformed or missing entry for "test" and a
+# valid entry for "test2"
+_INVALID_KEY_CASES = (
     """{
         "test2": {
             "ipv4": ["1.2.3.4", true],
@@ -612,89 +446,22 @@ def test_not_filled_json_object(addrfile_factory, contents):
             "ipv6": ["1234::/64", true]
         }
     }""",
-])
-def test_one_invalid_key(addrfile_factory, contents):
+)
+
+
+@pytest.mark.parametrize('prepared_addrfile', _INVALID_KEY_CASES,
+                         indirect=True)
+def test_one_invalid_key(prepared_addrfile):
     """Test reading an addrfile with one malformed/missing key and one valid
     key"""
-    addrfile = addrfile_factory(contents)
-
-    assert addrfile.get_ipv4("test") == (None, False)
-    assert addrfile.get_ipv6("test") == (None, False)
-    assert addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-
-    assert (addrfile.get_ipv4("test2") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile.get_ipv6("test2") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('1234::/64')
-    )
-    assert addrfile.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('5678::/64')
-    )
-
-    addrfile.set_ipv4("test", ipaddress.IPv4Address('1.2.3.4'))
-    addrfile.set_ipv6("test", ipaddress.IPv6Network('1234::/64'))
-    assert (addrfile.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert addrfile.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
+    addrfile = prepared_addrfile
+    _assert_state(addrfile, "test")
+    _assert_state(addrfile, "test2", (_A4_1234, True), (_N6_1234, True))
 
-    addrfile2 = ruddr.addrfile.Addrfile(addrfile.path)
+    addrfile.set_ipv4("test", _A4_1234)
+    addrfile.set_ipv6("test", _N6_1234)
+    _assert_state(addrfile, "test", (_A4_1234, True), (_N6_1234, True))
 
-    assert (addrfile2.get_ipv4("test") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile2.get_ipv6("test") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not addrfile2.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not addrfile2.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('1234::/64')
-    )
-    assert addrfile2.needs_ipv4_update(
-        "test", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile2.needs_ipv6_update(
-        "test", ipaddress.IPv6Network('5678::/64')
-    )
-
-    assert (addrfile2.get_ipv4("test2") ==
-            (ipaddress.IPv4Address('1.2.3.4'), True))
-    assert (addrfile2.get_ipv6("test2") ==
-            (ipaddress.IPv6Network('1234::/64'), True))
-    assert not addrfile2.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('1.2.3.4')
-    )
-    assert not addrfile2.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('1234::/64')
-    )
-    assert addrfile2.needs_ipv4_update(
-        "test2", ipaddress.IPv4Address('5.6.7.8')
-    )
-    assert addrfile2.needs_ipv6_update(
-        "test2", ipaddress.IPv6Network('5678::/64')
-    )
+    addrfile2 = ruddr.addrfile.Addrfile(addrfile.path)
+    _assert_state(addrfile2, "test", (_A4_1234, True), (_N6_1234, True))
+    _assert_state(addrfile2, "test2", (_A4_1234, True), (_N6_1234, True))
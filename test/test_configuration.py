@@ -14,32 +14,61 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import io
+import itertools
+import string
+
 import pytest
 
 import doubles
 import ruddr.configuration
 
+# A config with one notifier and one updater, plus $extra between them
+_MINIMAL_CONFIG = string.Template(
+    """
+    [notifier.test_notifier]
+    type = iface
 
-@pytest.fixture
-def configfile_factory(tmp_path):
+    $extra
+
+    [updater.test_updater]
+    type = standard
+    notifier = test_notifier
+    """
+)
+
+
+def _strip_lines(contents: str) -> str:
+    """Strip the indentation from each line of an inline config"""
+    return ''.join(f"{line.strip()}\n" for line in contents.splitlines())
+
+
+@pytest.fixture(scope='module')
+def configfile_factory(tmp_path_factory):
     """Fixture creating a factory for temporary config files"""
+    # One directory for the whole module. Every config file gets a unique
+    # name, so tests still never share a file.
+    directory = tmp_path_factory.mktemp('configs')
+    counter = itertools.count(1)
+
     class ConfigFileFactory:
         def __init__(self, contents):
-            with open(self.filename, 'w') as f:
-                for line in contents.splitlines():
-                    print(line.strip(), file=f)
+            self._filename = directory / f'config_{next(counter)}.ini'
+            self._filename.write_text(_strip_lines(contents))
 
         @property
         def filename(self):
-            return tmp_path / 'config.ini'
+            return self._filename
     return ConfigFileFactory
 
 
 @pytest.fixture
-def config_factory(configfile_factory):
+def config_factory():
+    """Fixture creating a factory for finalized configs. The config is read
+    from memory; tests for reading from a path use configfile_factory."""
     def factory(contents):
-        configfile = configfile_factory(contents)
-        config = ruddr.configuration.read_config_from_path(configfile.filename)
+        configfile = io.StringIO(_strip_lines(contents))
+        config = ruddr.configuration.read_config(configfile)
         config.finalize(lambda mod, typ: True, lambda mod, typ: True)
         return config
     return factory
@@ -177,55 +206,11 @@ def test_no_notifier(config_factory):
         )
 
 
-def test_extra_section_1(config_factory):
-    """Test config with extra section [foo] triggers error"""
-    with pytest.raises(ruddr.ConfigError):
-        config_factory(
-            """
-            [notifier.test_notifier]
-            type = iface
-
-            [foo]
-
-            [updater.test_updater]
-            type = standard
-            notifier = test_notifier
-            """
-        )
-
-
-def test_extra_section_2(config_factory):
-    """Test config with extra section [foo.] triggers error"""
+@pytest.mark.parametrize('extra', ['[foo]', '[foo.]', '[foo.bar]'])
+def test_extra_section(config_factory, extra):
+    """Test config with an extra section triggers error"""
     with pytest.raises(ruddr.ConfigError):
-        config_factory(
-            """
-            [notifier.test_notifier]
-            type = iface
-
-            [foo.]
-
-            [updater.test_updater]
-            type = standard
-            notifier = test_notifier
-            """
-        )
-
-
-def test_extra_section_3(config_factory):
-    """Test config with extra section [foo.bar] triggers error"""
-    with pytest.raises(ruddr.ConfigError):
-        config_factory(
-            """
-            [notifier.test_notifier]
-            type = iface
-
-            [foo.bar]
-
-            [updater.test_updater]
-            type = standard
-            notifier = test_notifier
-            """
-        )
+        config_factory(_MINIMAL_CONFIG.substitute(extra=extra))
 
 
 def test_notifier_no_name_1(config_factory):
@@ -464,61 +449,58 @@ def test_updater_invalid_type_2(configfile_factory):
         )
 
 
-def test_duplicate_keys_global_section(config_factory):
-    """Test duplicate keys in the [ruddr] section is error"""
-    with pytest.raises(ruddr.ConfigError):
-        config_factory(
-            """
-            [ruddr]
-            datadir = /var/lib/ruddr
-            datadir = /var/lib/ruddr
-
-            [notifier.test_notifier]
-            type = iface
-
-            [updater.test_updater]
-            type = standard
-            notifier = test_notifier
-            """
-        )
+@pytest.mark.parametrize('contents', [
+    pytest.param(
+        """
+        [ruddr]
+        datadir = /var/lib/ruddr
+        datadir = /var/lib/ruddr
 
+        [notifier.test_notifier]
+        type = iface
 
-def test_duplicate_keys_notifier(config_factory):
-    """Test duplicate keys in a notifier is error"""
-    with pytest.raises(ruddr.ConfigError):
-        config_factory(
-            """
-            [ruddr]
-            datadir = /var/lib/ruddr
+        [updater.test_updater]
+        type = standard
+        notifier = test_notifier
+        """,
+        id='global_section',
+    ),
+    pytest.param(
+        """
+        [ruddr]
+        datadir = /var/lib/ruddr
 
-            [notifier.test_notifier]
-            type = iface
-            type = iface
+        [notifier.test_notifier]
+        type = iface
+        type = iface
 
-            [updater.test_updater]
-            type = standard
-            notifier = test_notifier
-            """
-        )
+        [updater.test_updater]
+        type = standard
+        notifier = test_notifier
+        """,
+        id='notifier',
+    ),
+    pytest.param(
+        """
+        [ruddr]
+        datadir = /var/lib/ruddr
 
+        [notifier.test_notifier]
+        type = iface
 
-def test_duplicate_keys_updater(config_factory):
-    """Test duplicate keys in an updater is error"""
+        [updater.test_updater]
+        type = standard
+        notifier = test_notifier
+        notifier = test_notifier
+        """,
+        id='updater',
+    ),
+])
+def test_duplicate_keys(config_factory, contents):
+    """Test duplicate keys in the [ruddr] section, a notifier, or an updater
+    is error"""
     with pytest.raises(ruddr.ConfigError):
-        config_factory(
-            """
-            [ruddr]
-            datadir = /var/lib/ruddr
-
-            [notifier.test_notifier]
-            type = iface
-
-            [updater.test_updater]
-            type = standard
-            notifier = test_notifier
-            notifier = test_notifier
-            """
-        )
+        config_factory(contents)
 
 
 def test_redundant_notifier_keys(config_factory):
@@ -635,9 +617,11 @@ def test_global_notifier46(config_factory):
     }}
 
 
-def test_global_and_updater_notifier_1(config_factory):
-    """Test combo 1 of notifier, notifier4, notifier6, both global and local"""
-    config = config_factory(
+@pytest.mark.parametrize(('contents', 'main', 'updaters'), [
+    # contents: config file contents
+    # main: expected config.main
+    # updaters: expected config.updaters
+    pytest.param(
         """[ruddr]
         datadir = /var/lib/ruddr_data
         notifier4 = test_notifier
@@ -658,33 +642,29 @@ def test_global_and_updater_notifier_1(config_factory):
         [updater.test_updater2]
         type = standard
         notifier = test_notifier3
-        """
-    )
-
-    assert config.main == {
-        "datadir": "/var/lib/ruddr_data",
-        "notifier4": "test_notifier",
-        "notifier6": "test_notifier2",
-    }
-    assert config.updaters == {
-        "test_updater": {
-            "type": "standard",
+        """,
+        {
+            "datadir": "/var/lib/ruddr_data",
             "notifier4": "test_notifier",
             "notifier6": "test_notifier2",
-            "datadir": "/var/lib/ruddr_data",
         },
-        "test_updater2": {
-            "type": "standard",
-            "notifier4": "test_notifier3",
-            "notifier6": "test_notifier3",
-            "datadir": "/var/lib/ruddr_data",
+        {
+            "test_updater": {
+                "type": "standard",
+                "notifier4": "test_notifier",
+                "notifier6": "test_notifier2",
+                "datadir": "/var/lib/ruddr_data",
+            },
+            "test_updater2": {
+                "type": "standard",
+                "notifier4": "test_notifier3",
+                "notifier6": "test_notifier3",
+                "datadir": "/var/lib/ruddr_data",
+            },
         },
-    }
-
-
-def test_global_and_updater_notifier_2(config_factory):
-    """Test combo 2 of notifier, notifier4, notifier6, both global and local"""
-    config = config_factory(
+        id='combo_1',
+    ),
+    pytest.param(
         """[ruddr]
         datadir = /var/lib/ruddr_data
         notifier6 = test_notifier2
@@ -704,31 +684,27 @@ def test_global_and_updater_notifier_2(config_factory):
         [updater.test_updater2]
         type = standard
         notifier = test_notifier3
-        """
-    )
-
-    assert config.main == {
-        "datadir": "/var/lib/ruddr_data",
-        "notifier6": "test_notifier2",
-    }
-    assert config.updaters == {
-        "test_updater": {
-            "type": "standard",
-            "notifier6": "test_notifier2",
+        """,
+        {
             "datadir": "/var/lib/ruddr_data",
+            "notifier6": "test_notifier2",
         },
-        "test_updater2": {
-            "type": "standard",
-            "notifier4": "test_notifier3",
-            "notifier6": "test_notifier3",
-            "datadir": "/var/lib/ruddr_data",
+        {
+            "test_updater": {
+                "type": "standard",
+                "notifier6": "test_notifier2",
+                "datadir": "/var/lib/ruddr_data",
+            },
+            "test_updater2": {
+                "type": "standard",
+                "notifier4": "test_notifier3",
+                "notifier6": "test_notifier3",
+                "datadir": "/var/lib/ruddr_data",
+            },
         },
-    }
-
-
-def test_global_and_updater_notifier_3(config_factory):
-    """Test combo 3 of notifier, notifier4, notifier6, both global and local"""
-    config = config_factory(
+        id='combo_2',
+    ),
+    pytest.param(
         """[ruddr]
         datadir = /var/lib/ruddr_data
         notifier6 = test_notifier2
@@ -749,30 +725,26 @@ def test_global_and_updater_notifier_3(config_factory):
         [updater.test_updater2]
         type = standard
         notifier4 = test_notifier3
-        """
-    )
-
-    assert config.main == {
-        "datadir": "/var/lib/ruddr_data",
-        "notifier6": "test_notifier2",
-    }
-    assert config.updaters == {
-        "test_updater": {
-            "type": "standard",
-            "notifier6": "test_notifier",
+        """,
+        {
             "datadir": "/var/lib/ruddr_data",
+            "notifier6": "test_notifier2",
         },
-        "test_updater2": {
-            "type": "standard",
-            "notifier4": "test_notifier3",
-            "datadir": "/var/lib/ruddr_data",
+        {
+            "test_updater": {
+                "type": "standard",
+                "notifier6": "test_notifier",
+                "datadir": "/var/lib/ruddr_data",
+            },
+            "test_updater2": {
+                "type": "standard",
+                "notifier4": "test_notifier3",
+                "datadir": "/var/lib/ruddr_data",
+            },
         },
-    }
-
-
-def test_global_and_updater_notifier_4(config_factory):
-    """Test combo 4 of notifier, notifier4, notifier6, both global and local"""
-    config = config_factory(
+        id='combo_3',
+    ),
+    pytest.param(
         """[ruddr]
         datadir = /var/lib/ruddr_data
         notifier = test_notifier2
@@ -793,30 +765,26 @@ def test_global_and_updater_notifier_4(config_factory):
         [updater.test_updater2]
         type = standard
         notifier4 = test_notifier3
-        """
-    )
-
-    assert config.main == {
-        "datadir": "/var/lib/ruddr_data",
-        "notifier": "test_notifier2",
-    }
-    assert config.updaters == {
-        "test_updater": {
-            "type": "standard",
-            "notifier6": "test_notifier",
+        """,
+        {
             "datadir": "/var/lib/ruddr_data",
+            "notifier": "test_notifier2",
         },
-        "test_updater2": {
-            "type": "standard",
-            "notifier4": "test_notifier3",
-            "datadir": "/var/lib/ruddr_data",
+        {
+            "test_updater": {
+                "type": "standard",
+                "notifier6": "test_notifier",
+                "datadir": "/var/lib/ruddr_data",
+            },
+            "test_updater2": {
+                "type": "standard",
+                "notifier4": "test_notifier3",
+                "datadir": "/var/lib/ruddr_data",
+            },
         },
-    }
-
-
-def test_global_and_updater_notifier_5(config_factory):
-    """Test combo 5 of notifier, notifier4, notifier6, both global and local"""
-    config = config_factory(
+        id='combo_4',
+    ),
+    pytest.param(
         """[ruddr]
         datadir = /var/lib/ruddr_data
         notifier = test_notifier
@@ -841,32 +809,28 @@ def test_global_and_updater_notifier_5(config_factory):
         type = standard
         notifier4 = test_notifier3
         notifier6 = test_notifier4
-        """
-    )
-
-    assert config.main == {
-        "datadir": "/var/lib/ruddr_data",
-        "notifier": "test_notifier",
-    }
-    assert config.updaters == {
-        "test_updater": {
-            "type": "standard",
-            "notifier4": "test_notifier2",
-            "notifier6": "test_notifier2",
+        """,
+        {
             "datadir": "/var/lib/ruddr_data",
+            "notifier": "test_notifier",
         },
-        "test_updater2": {
-            "type": "standard",
-            "notifier4": "test_notifier3",
-            "notifier6": "test_notifier4",
-            "datadir": "/var/lib/ruddr_data",
+        {
+            "test_updater": {
+                "type": "standard",
+                "notifier4": "test_notifier2",
+                "notifier6": "test_notifier2",
+                "datadir": "/var/lib/ruddr_data",
+            },
+            "test_updater2": {
+                "type": "standard",
+                "notifier4": "test_notifier3",
+                "notifier6": "test_notifier4",
+                "datadir": "/var/lib/ruddr_data",
+            },
         },
-    }
-
-
-def test_global_and_updater_notifier_6(config_factory):
-    """Test combo 6 of notifier, notifier4, notifier6, both global and local"""
-    config = config_factory(
+        id='combo_5',
+    ),
+    pytest.param(
         """[ruddr]
         datadir = /var/lib/ruddr_data
         notifier4 = test_notifier
@@ -891,28 +855,35 @@ def test_global_and_updater_notifier_6(config_factory):
         type = standard
         notifier4 = test_notifier3
         notifier6 = test_notifier4
-        """
-    )
-
-    assert config.main == {
-        "datadir": "/var/lib/ruddr_data",
-        "notifier4": "test_notifier",
-        "notifier6": "test_notifier2",
-    }
-    assert config.updaters == {
-        "test_updater": {
-            "type": "standard",
+        """,
+        {
+            "datadir": "/var/lib/ruddr_data",
             "notifier4": "test_notifier",
             "notifier6": "test_notifier2",
-            "datadir": "/var/lib/ruddr_data",
         },
-        "test_updater2": {
-            "type": "standard",
-            "notifier4": "test_notifier3",
-            "notifier6": "test_notifier4",
-            "datadir": "/var/lib/ruddr_data",
+        {
+            "test_updater": {
+                "type": "standard",
+                "notifier4": "test_notifier",
+                "notifier6": "test_notifier2",
+                "datadir": "/var/lib/ruddr_data",
+            },
+            "test_updater2": {
+                "type": "standard",
+                "notifier4": "test_notifier3",
+                "notifier6": "test_notifier4",
+                "datadir": "/var/lib/ruddr_data",
+            },
         },
-    }
+        id='combo_6',
+    ),
+])
+def test_global_and_updater_notifier(config_factory,
+                                     contents, main, updaters):
+    """Test combos of notifier, notifier4, notifier6, both global and local"""
+    config = config_factory(contents)
+    assert config.main == main
+    assert config.updaters == updaters
 
 
 def test_missing_notifier(config_factory):
@@ -22,6 +22,20 @@ import ruddr.manager
 
 import pytest
 
+# Addresses used throughout. These are immutable, so sharing them is safe.
+_V4_A = ipaddress.IPv4Address('1.2.3.4')
+_V4_B = ipaddress.IPv4Address('5.6.7.8')
+_V6_A = ipaddress.IPv6Network('1234::/64')
+_V6_B = ipaddress.IPv6Network('5678::/64')
+
+# Built-in notifiers most validation tests start from. Tests must copy it
+# before passing it in, since validation adds to the dict it's given.
+_BUILT_INS = {
+    'test': doubles.FakeNotifier,
+}
+# Key for doubles.MockNotifier once imported by module and class name
+_MOCK_NOTIFIER_KEY = ('doubles', 'MockNotifier')
+
 
 class TestUpdaterNotifierValidation:
     @pytest.mark.parametrize('expected', [True, False])
@@ -64,152 +78,96 @@ class TestUpdaterNotifierValidation:
             ("updater", updaters, 'testmod', 'testtype'),
         )
 
-    def test_built_in(self):
-        """Test _validate_updater_or_notifier_type with a "built-in"
-        notifier"""
-        notifiers = {
-            'test': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, None, 'test'
-        )
-        assert result
-        assert notifiers == {
-            'test': doubles.FakeNotifier,
-        }
-
-    def test_entry_point(self):
-        """Test _validate_updater_or_notifier_type with an entry_point
-        notifier"""
-        notifiers = {
-            'test': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, None, '_test'
-        )
-        assert result
-        assert notifiers == {
-            'test': doubles.FakeNotifier,
-            '_test': ruddr.notifiers.static.StaticNotifier,
-        }
-
-    def test_built_in_entry_point_conflict(self):
-        """Test _validate_updater_or_notifier_type with a type matching both a
-        built-in and an entry_point notifier and ensure built-in isn't
-        replaced"""
-        notifiers = {
-            '_test': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, None, '_test'
-        )
-        assert result
-        assert notifiers == {
-            '_test': doubles.FakeNotifier,
-        }
-
-    def test_no_such_type(self):
-        """Test _validate_updater_or_notifier_type with a type that doesn't
-        match anything"""
-        notifiers = {
-            'test': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, None, 'test_invalid'
-        )
-        assert not result
-        assert notifiers == {
-            'test': doubles.FakeNotifier,
-        }
-
-    def test_module_and_class(self):
-        """Test _validate_updater_or_notifier_type with a module and class"""
-        notifiers = {
-            'test': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, 'doubles', 'MockNotifier'
-        )
-        assert result
-        assert notifiers == {
-            'test': doubles.FakeNotifier,
-            ('doubles', 'MockNotifier'): doubles.MockNotifier
-        }
-
-    def test_module_not_importable(self):
-        """Test _validate_updater_or_notifier_type with a module and class but
-        module not importable"""
-        notifiers = {
-            'test': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, 'invalid', 'MockNotifier'
-        )
-        assert not result
-        assert notifiers == {
-            'test': doubles.FakeNotifier,
-        }
-
-    def test_class_not_in_module(self):
-        """Test _validate_updater_or_notifier_type with a module and class but
-        class not in module"""
-        notifiers = {
-            'test': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, 'doubles', 'InvalidNotifier'
-        )
-        assert not result
-        assert notifiers == {
-            'test': doubles.FakeNotifier,
-        }
-
-    def test_module_and_class_already_imported(self):
-        """Test _validate_updater_or_notifier_type with a module and class
-        already imported"""
-        notifiers = {
-            'test': doubles.FakeNotifier,
-            ('doubles', 'MockNotifier'): doubles.MockNotifier
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, 'doubles', 'MockNotifier'
-        )
-        assert result
-        assert notifiers == {
-            'test': doubles.FakeNotifier,
-            ('doubles', 'MockNotifier'): doubles.MockNotifier,
-        }
-
-    def test_class_matches_built_in(self):
-        """Test _validate_updater_or_notifier_type with a module and class
-        where class name matches a built-in notifier"""
-        notifiers = {
-            'MockNotifier': doubles.FakeNotifier,
-        }
-        result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, 'doubles', 'MockNotifier'
-        )
-        assert result
-        assert notifiers == {
-            'MockNotifier': doubles.FakeNotifier,
-            ('doubles', 'MockNotifier'): doubles.MockNotifier,
-        }
-
-    def test_class_imported_matches_built_in(self):
-        """Test _validate_updater_or_notifier_type with a module and class
-        already imported where class name matches a built-in notifier"""
-        notifiers = {
-            'MockNotifier': doubles.FakeNotifier,
-            ('doubles', 'MockNotifier'): doubles.MockNotifier,
-        }
+    @pytest.mark.parametrize(
+        ('existing', 'module', 'type_', 'expected', 'final'), [
+            # existing: notifiers already known before validating
+            # module, type_: what to validate
+            # expected: whether validation should succeed
+            # final: notifiers known afterward
+            pytest.param(
+                _BUILT_INS, None, 'test', True, _BUILT_INS,
+                id='built_in',
+            ),
+            pytest.param(
+                _BUILT_INS, None, '_test', True,
+                {**_BUILT_INS, '_test': ruddr.notifiers.static.StaticNotifier},
+                id='entry_point',
+            ),
+            # A built-in matching an entry point must not be replaced
+            pytest.param(
+                {'_test': doubles.FakeNotifier}, None, '_test', True,
+                {'_test': doubles.FakeNotifier},
+                id='built_in_entry_point_conflict',
+            ),
+            pytest.param(
+                _BUILT_INS, None, 'test_invalid', False, _BUILT_INS,
+                id='no_such_type',
+            ),
+            pytest.param(
+                _BUILT_INS, 'doubles', 'MockNotifier', True,
+                {**_BUILT_INS, _MOCK_NOTIFIER_KEY: doubles.MockNotifier},
+                id='module_and_class',
+            ),
+            pytest.param(
+                _BUILT_INS, 'invalid', 'MockNotifier', False, _BUILT_INS,
+                id='module_not_importable',
+            ),
+            pytest.param(
+                _BUILT_INS, 'doubles', 'InvalidNotifier', False, _BUILT_INS,
+                id='class_not_in_module',
+            ),
+            pytest.param(
+                {**_BUILT_INS, _MOCK_NOTIFIER_KEY: doubles.MockNotifier},
+                'doubles', 'MockNotifier', True,
+                {**_BUILT_INS, _MOCK_NOTIFIER_KEY: doubles.MockNotifier},
+                id='module_and_class_already_imported',
+            ),
+            pytest.param(
+                {'MockNotifier': doubles.FakeNotifier},
+                'doubles', 'MockNotifier', True,
+                {'MockNotifier': doubles.FakeNotifier,
+                 _MOCK_NOTIFIER_KEY: doubles.MockNotifier},
+                id='class_matches_built_in',
+            ),
+            pytest.param(
+                {'MockNotifier': doubles.FakeNotifier,
+                 _MOCK_NOTIFIER_KEY: doubles.MockNotifier},
+                'doubles', 'MockNotifier', True,
+                {'MockNotifier': doubles.FakeNotifier,
+                 _MOCK_NOTIFIER_KEY: doubles.MockNotifier},
+                id='class_imported_matches_built_in',
+            ),
+        ]
+    )
+    def test_validate(self, existing, module, type_, expected, final):
+        """Test _validate_updater_or_notifier_type with built-in, entry point,
+        and module/class notifiers, and that it only adds to the known
+        notifiers what it newly imports"""
+        # Copy, since validation adds to the dict it's given
+        notifiers = dict(existing)
         result = ruddr.manager._validate_updater_or_notifier_type(
-            'notifier', notifiers, 'doubles', 'MockNotifier'
+            'notifier', notifiers, module, type_
         )
-        assert result
-        assert notifiers == {
-            'MockNotifier': doubles.FakeNotifier,
-            ('doubles', 'MockNotifier'): doubles.MockNotifier,
-        }
+        assert result is expected
+        assert notifiers == final
+
+    def test_entry_points_discovered_once(self, mocker):
+        """Test entry points are only discovered once per group, however
+        many types are looked up"""
+        discover = mocker.patch("ruddr.manager.entry_points",
+                                return_value={})
+        ruddr.manager._entry_points.cache_clear()
+        try:
+            for type_ in ('_test1', '_test2'):
+                assert not ruddr.manager._validate_updater_or_notifier_type(
+                    'notifier', {}, None, type_
+                )
+            assert discover.call_args_list == [
+                ((), {'group': 'ruddr.notifier'}),
+            ]
+        finally:
+            # Don't leave the mocked result cached for other tests
+            ruddr.manager._entry_points.cache_clear()
 
 
 class TestDDNSManager:
@@ -343,38 +301,33 @@ class TestDDNSManager:
                 'test_val')
         assert manager.updaters['test_updater'].addrfile == manager.addrfile
 
-    def test_manager_attaches_notifier4(self):
-        """Test that DDNSManager attaches a notifier to an updater with
-        notifier4"""
-        config = ruddr.Config(
-            main={},
-            notifiers={
-                'test_notifier': {
-                    'type': 'test',
-                }
-            },
-            updaters={
-                'test_updater': {
-                    'type': 'test',
-                    'notifier4': 'test_notifier',
-                }
-            },
-        )
-        manager = ruddr.manager.DDNSManager(config)
-        notifier = manager.notifiers['test_notifier']
-        updater = manager.updaters['test_updater']
-        assert updater.initial_update_calls == [
-            (True, False)
-        ]
-        notifier.notify_ipv4(ipaddress.IPv4Address('1.2.3.4'))
-        notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-        assert updater.published_addresses == [
-            ipaddress.IPv4Address('1.2.3.4'),
-        ]
-
-    def test_manager_attaches_notifier6(self):
+    @pytest.mark.parametrize(('wiring', 'initial_update', 'published'), [
+        # wiring: the updater's notifier keys
+        # initial_update: expected (do_ipv4, do_ipv6) for initial_update
+        # published: addresses the updater should receive
+        pytest.param(
+            ('notifier4',),
+            (True, False),
+            [_V4_A],
+            id='notifier4',
+        ),
+        pytest.param(
+            ('notifier6',),
+            (False, True),
+            [_V6_A],
+            id='notifier6',
+        ),
+        pytest.param(
+            ('notifier4', 'notifier6'),
+            (True, True),
+            [_V4_A, _V6_A],
+            id='notifier4_and_notifier6',
+        ),
+    ])
+    def test_manager_attaches_notifier(self, wiring, initial_update,
+                                       published):
         """Test that DDNSManager attaches a notifier to an updater with
-        notifier6"""
+        notifier4, notifier6, or both"""
         config = ruddr.Config(
             main={},
             notifiers={
@@ -385,52 +338,17 @@ class TestDDNSManager:
             updaters={
                 'test_updater': {
                     'type': 'test',
-                    'notifier6': 'test_notifier',
+                    **{key: 'test_notifier' for key in wiring},
                 }
             },
         )
         manager = ruddr.manager.DDNSManager(config)
         notifier = manager.notifiers['test_notifier']
         updater = manager.updaters['test_updater']
-        assert updater.initial_update_calls == [
-            (False, True)
-        ]
-        notifier.notify_ipv4(ipaddress.IPv4Address('1.2.3.4'))
-        notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-        assert updater.published_addresses == [
-            ipaddress.IPv6Network('1234::/64'),
-        ]
-
-    def test_manager_attaches_notifier4_and_notifier6(self):
-        """Test that DDNSManager attaches a notifier to an updater with
-        notifier4 and notifier6"""
-        config = ruddr.Config(
-            main={},
-            notifiers={
-                'test_notifier': {
-                    'type': 'test',
-                }
-            },
-            updaters={
-                'test_updater': {
-                    'type': 'test',
-                    'notifier4': 'test_notifier',
-                    'notifier6': 'test_notifier',
-                }
-            },
-        )
-        manager = ruddr.manager.DDNSManager(config)
-        notifier = manager.notifiers['test_notifier']
-        updater = manager.updaters['test_updater']
-        assert updater.initial_update_calls == [
-            (True, True)
-        ]
-        notifier.notify_ipv4(ipaddress.IPv4Address('1.2.3.4'))
-        notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-        assert updater.published_addresses == [
-            ipaddress.IPv4Address('1.2.3.4'),
-            ipaddress.IPv6Network('1234::/64'),
-        ]
+        assert updater.initial_update_calls == [initial_update]
+        notifier.notify_ipv4(_V4_A)
+        notifier.notify_ipv6(_V6_A)
+        assert updater.published_addresses == published
 
     def test_manager_attaches_different_notifier4_and_notifier6(self):
         """Test that DDNSManager attaches two notifiers to an updater with
@@ -460,13 +378,13 @@ class TestDDNSManager:
         assert updater.initial_update_calls == [
             (True, True)
         ]
-        notifier.notify_ipv4(ipaddress.IPv4Address('1.2.3.4'))
-        notifier.notify_ipv6(ipaddress.IPv6Network('1234::/64'))
-        notifier2.notify_ipv4(ipaddress.IPv4Address('5.6.7.8'))
-        notifier2.notify_ipv6(ipaddress.IPv6Network('5678::/64'))
+        notifier.notify_ipv4(_V4_A)
+        notifier.notify_ipv6(_V6_A)
+        notifier2.notify_ipv4(_V4_B)
+        notifier2.notify_ipv6(_V6_B)
         assert updater.published_addresses == [
-            ipaddress.IPv4Address('1.2.3.4'),
-            ipaddress.IPv6Network('5678::/64'),
+            _V4_A,
+            _V6_B,
         ]
 
     @pytest.mark.parametrize('skipping', ['ipv4', 'ipv6', None])
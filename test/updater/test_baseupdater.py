@@ -19,14 +19,15 @@ import logging
 
 import pytest
 
+import doubles
 import ruddr
 from ruddr import FatalPublishError, PublishError
 
 
-def test_member_vars(updater_factory, empty_addrfile):
+def test_member_vars(empty_addrfile):
     """Test BaseUpdater has basic member variables name, log, and addrfile"""
-    updater = updater_factory(addrfile=empty_addrfile)
-    assert updater.name == "mock_updater_1"
+    updater = doubles.MockBaseUpdater('mock_updater', addrfile=empty_addrfile)
+    assert updater.name == "mock_updater"
     assert isinstance(updater.log, logging.Logger)
     assert updater.log.name == f"ruddr.updater.{updater.name}"
     assert updater.addrfile is empty_addrfile